@@ -5,16 +5,30 @@ import logging
 
 
 # External libraries
-from curl_cffi import requests
 from rich.console import Console
 from pywidevine.cdm import Cdm
 from pywidevine.device import Device
 from pywidevine.pssh import PSSH
 
 
+# Internal utilities
+from StreamingCommunity.Util.http_client import create_client_curl
+
+
 # Variable
 console = Console()
 
+# Shared session for license requests: keeps the TLS connection alive across
+# calls instead of paying a full handshake per license
+_license_session = None
+
+
+def _get_license_session():
+    global _license_session
+    if _license_session is None:
+        _license_session = create_client_curl(impersonate="chrome124")
+    return _license_session
+
 
 def get_widevine_keys(pssh, license_url, cdm_device_path, headers=None, payload=None):
     """
@@ -39,10 +53,10 @@ def get_widevine_keys(pssh, license_url, cdm_device_path, headers=None, payload=
             req_headers = headers or {}
             req_headers['Content-Type'] = 'application/octet-stream'
 
-            # Send license request using curl_cffi
+            # Send license request using the shared curl_cffi session
             try:
                 # response = httpx.post(license_url, data=challenge, headers=req_headers, content=payload)
-                response = requests.post(license_url, data=challenge, headers=req_headers, json=payload, impersonate="chrome124")
+                response = _get_license_session().post(license_url, data=challenge, headers=req_headers, json=payload)
             except Exception as e:
                 console.print(f"[bold red]Request error:[/bold red] {e}")
                 return None
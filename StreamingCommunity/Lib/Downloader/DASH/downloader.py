@@ -1,20 +1,27 @@
 # 25.07.25
 
 import os
+import sys
+import queue
 import shutil
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
 from typing import Optional, Dict
 
 
 # External libraries
 from rich.console import Console
+from rich.segment import Segments
 from rich.table import Table
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.os import os_manager, internet_manager, get_wvd_path
-from StreamingCommunity.Util.http_client import create_client
+from StreamingCommunity.Util.http_client import create_async_client
 from StreamingCommunity.Util.headers import get_userAgent
 
 
@@ -26,12 +33,12 @@ from .cdm_helpher import get_widevine_keys
 
 
 # FFmpeg functions
-from ...FFmpeg import print_duration_table, join_audios, join_video, join_subtitle
+from ...FFmpeg import print_duration_table, join_audios, join_video, join_subtitle, join_av_and_subs
 
 
 # Config
 DOWNLOAD_SPECIFIC_AUDIO = config_manager.get_list('M3U8_DOWNLOAD', 'specific_list_audio')
-DOWNLOAD_SPECIFIC_SUBTITLE = config_manager.get_list('M3U8_DOWNLOAD', 'specific_list_subtitles')
+DOWNLOAD_SPECIFIC_SUBTITLE = frozenset(config_manager.get_list('M3U8_DOWNLOAD', 'specific_list_subtitles'))
 MERGE_SUBTITLE = config_manager.get_bool('M3U8_DOWNLOAD', 'merge_subs')
 FILTER_CUSTOM_REOLUTION = str(config_manager.get('M3U8_CONVERSION', 'force_resolution')).strip().lower()
 CLEANUP_TMP = config_manager.get_bool('M3U8_DOWNLOAD', 'cleanup_tmp_folder')
@@ -41,7 +48,82 @@ EXTENSION_OUTPUT = config_manager.get("M3U8_CONVERSION", "extension")
 
 # Variable
 console = Console()
-extension_output = config_manager.get("M3U8_CONVERSION", "extension")
+
+# Rendered manifest tables keyed on row content: identical selections across
+# episodes of a series skip the Rich layout pass entirely
+_TABLE_CACHE = {}
+
+# Reusable 64 KiB write buffers for subtitle streaming (LIFO keeps hot buffers on top)
+SUB_CHUNK_SIZE = 65536
+_BUF_POOL: "queue.LifoQueue[bytearray]" = queue.LifoQueue()
+
+
+def _get_buffer() -> bytearray:
+    try:
+        return _BUF_POOL.get_nowait()
+    except queue.Empty:
+        return bytearray(SUB_CHUNK_SIZE)
+
+
+def _fast_link(src: str, dst: str):
+    """
+    Duplicate src to dst without moving file bytes when possible.
+
+    Tries a hardlink first (zero bytes copied), then a reflink clone on
+    filesystems that support it (btrfs/XFS), and only falls back to a full
+    shutil.copy2 when neither is available.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    # Reflink clone (FICLONE ioctl) - shares extents, no data copied
+    if sys.platform == "linux":
+        try:
+            import fcntl
+            FICLONE = 0x40049409
+
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return
+        except OSError:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+
+    # In-kernel copy: no user-space buffering, one syscall per large block
+    if hasattr(os, 'copy_file_range') or hasattr(os, 'sendfile'):
+        try:
+            stat_src = os.stat(src)
+
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = stat_src.st_size
+                offset = 0
+
+                while remaining > 0:
+                    if hasattr(os, 'copy_file_range'):
+                        sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    else:
+                        sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, remaining)
+
+                    if sent == 0:
+                        break
+
+                    offset += sent
+                    remaining -= sent
+
+            if remaining == 0:
+                # Match shutil.copy2 timestamp semantics
+                os.utime(dst, (stat_src.st_atime, stat_src.st_mtime))
+                return
+
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
 
 
 class DASH_Downloader:
@@ -59,7 +141,6 @@ class DASH_Downloader:
         self.license_url = license_url
         self.mpd_url = mpd_url
         self.mpd_sub_list = mpd_sub_list or []
-        self.out_path = os.path.splitext(os.path.abspath(os_manager.get_sanitize_path(output_path)))[0]
         self.original_output_path = output_path
         self.file_already_exists = os.path.exists(self.original_output_path)
         self.parser = None
@@ -70,6 +151,10 @@ class DASH_Downloader:
         self.selected_video = None
         self.selected_audio = None
 
+        # Parallel path/language lists for the selected subtitles (built at parse time)
+        self._sub_paths = []
+        self._sub_langs = []
+
         self._setup_temp_dirs()
 
         self.error = None
@@ -80,6 +165,14 @@ class DASH_Downloader:
         self.current_downloader: Optional[MPD_Segments] = None
         self.current_download_type: Optional[str] = None
 
+    @cached_property
+    def out_path(self):
+        """
+        Sanitized absolute output path without extension, computed on first use
+        so that already-downloaded items skip the path normalization entirely.
+        """
+        return os.path.splitext(os.path.abspath(os_manager.get_sanitize_path(self.original_output_path)))[0]
+
     def _setup_temp_dirs(self):
         """
         Create temporary folder structure under out_path\tmp
@@ -93,10 +186,15 @@ class DASH_Downloader:
         self.optimize_dir = os.path.join(self.tmp_dir, "optimize")
         self.subs_dir = os.path.join(self.tmp_dir, "subs")
         
-        os.makedirs(self.encrypted_dir, exist_ok=True)
-        os.makedirs(self.decrypted_dir, exist_ok=True)
-        os.makedirs(self.optimize_dir, exist_ok=True)
-        os.makedirs(self.subs_dir, exist_ok=True)
+        # Create the parent once, then one plain mkdir per subdir (EAFP instead
+        # of the extra stat that exist_ok performs for every path component)
+        Path(self.tmp_dir).mkdir(parents=True, exist_ok=True)
+
+        for directory in (self.encrypted_dir, self.decrypted_dir, self.optimize_dir, self.subs_dir):
+            try:
+                os.mkdir(directory)
+            except FileExistsError:
+                pass
 
     def parse_manifest(self, custom_headers):
         """
@@ -108,121 +206,176 @@ class DASH_Downloader:
         self.parser = MPDParser(self.mpd_url)
         self.parser.parse(custom_headers)
 
-        def calculate_column_widths():
-            """Calculate optimal column widths based on content."""
-            data_rows = []
-            
-            # Video info
-            selected_video, list_available_resolution, filter_custom_resolution, downloadable_video = self.parser.select_video(FILTER_CUSTOM_REOLUTION)
-            self.selected_video = selected_video
-            
-            available_video = ', '.join(list_available_resolution) if list_available_resolution else "Nothing"
-            set_video = str(filter_custom_resolution) if filter_custom_resolution else "Nothing"
-            downloadable_video_str = str(downloadable_video) if downloadable_video else "Nothing"
-            
-            data_rows.append(["Video", available_video, set_video, downloadable_video_str])
+        data_rows = []
 
-            # Audio info
-            selected_audio, list_available_audio_langs, filter_custom_audio, downloadable_audio = self.parser.select_audio(DOWNLOAD_SPECIFIC_AUDIO)
-            self.selected_audio = selected_audio
-            
-            if list_available_audio_langs:
-                available_audio = ', '.join(list_available_audio_langs)
-                set_audio = str(filter_custom_audio) if filter_custom_audio else "Nothing"
-                downloadable_audio_str = str(downloadable_audio) if downloadable_audio else "Nothing"
-                
-                data_rows.append(["Audio", available_audio, set_audio, downloadable_audio_str])
-            
-            # Subtitle info
-            available_sub_languages = [sub.get('language') for sub in self.mpd_sub_list]
-            
-            if available_sub_languages:
-                available_subs = ', '.join(available_sub_languages)
-                
-                # Filter subtitles based on configuration
-                if "*" in DOWNLOAD_SPECIFIC_SUBTITLE:
-                    self.selected_subs = self.mpd_sub_list
-                    downloadable_sub_languages = available_sub_languages
-                else:
-                    self.selected_subs = [
-                        sub for sub in self.mpd_sub_list 
-                        if sub.get('language') in DOWNLOAD_SPECIFIC_SUBTITLE
-                    ]
-                    downloadable_sub_languages = [sub.get('language') for sub in self.selected_subs]
-                
-                downloadable_subs = ', '.join(downloadable_sub_languages) if downloadable_sub_languages else "Nothing"
-                set_subs = ', '.join(DOWNLOAD_SPECIFIC_SUBTITLE) if DOWNLOAD_SPECIFIC_SUBTITLE else "Nothing"
-                
-                data_rows.append(["Subtitle", available_subs, set_subs, downloadable_subs])
-            
-            # Calculate max width for each column
-            headers = ["Type", "Available", "Set", "Downloadable"]
-            max_widths = [len(header) for header in headers]
-            
+        # Video info
+        selected_video, list_available_resolution, filter_custom_resolution, downloadable_video = self.parser.select_video(FILTER_CUSTOM_REOLUTION)
+        self.selected_video = selected_video
+
+        available_video = ', '.join(list_available_resolution) if list_available_resolution else "Nothing"
+        set_video = str(filter_custom_resolution) if filter_custom_resolution else "Nothing"
+        downloadable_video_str = str(downloadable_video) if downloadable_video else "Nothing"
+
+        data_rows.append(["Video", available_video, set_video, downloadable_video_str])
+
+        # Audio info
+        selected_audio, list_available_audio_langs, filter_custom_audio, downloadable_audio = self.parser.select_audio(DOWNLOAD_SPECIFIC_AUDIO)
+        self.selected_audio = selected_audio
+
+        if list_available_audio_langs:
+            available_audio = ', '.join(list_available_audio_langs)
+            set_audio = str(filter_custom_audio) if filter_custom_audio else "Nothing"
+            downloadable_audio_str = str(downloadable_audio) if downloadable_audio else "Nothing"
+
+            data_rows.append(["Audio", available_audio, set_audio, downloadable_audio_str])
+
+        # Subtitle info: extract languages and apply the filter in one pass
+        if self.mpd_sub_list:
+            keep_all = "*" in DOWNLOAD_SPECIFIC_SUBTITLE
+            available_sub_languages = []
+            downloadable_sub_languages = []
+            selected_subs = []
+
+            for sub in self.mpd_sub_list:
+                language = sub.get('language')
+                available_sub_languages.append(language)
+
+                if keep_all or language in DOWNLOAD_SPECIFIC_SUBTITLE:
+                    selected_subs.append(sub)
+                    downloadable_sub_languages.append(language)
+
+            self.selected_subs = selected_subs
+
+            # Precompute subtitle paths once so finalize does no per-call formatting
+            self._sub_langs = downloadable_sub_languages
+            self._sub_paths = [
+                os.path.join(self.subs_dir, f"{sub.get('language', 'unknown')}.{sub.get('format', 'vtt')}")
+                for sub in selected_subs
+            ]
+
+            available_subs = ', '.join(available_sub_languages)
+            downloadable_subs = ', '.join(downloadable_sub_languages) if downloadable_sub_languages else "Nothing"
+            set_subs = ', '.join(DOWNLOAD_SPECIFIC_SUBTITLE) if DOWNLOAD_SPECIFIC_SUBTITLE else "Nothing"
+
+            data_rows.append(["Subtitle", available_subs, set_subs, downloadable_subs])
+
+        # Render the table once per distinct content and reuse the segments
+        cache_key = tuple(tuple(row) for row in data_rows)
+        rendered_table = _TABLE_CACHE.get(cache_key)
+
+        if rendered_table is None:
+
+            # Create table: Rich computes the column widths from the content
+            table = Table(show_header=True, header_style="bold cyan", border_style="blue")
+            table.add_column("Type", style="cyan bold")
+            table.add_column("Available", style="green")
+            table.add_column("Set", style="red")
+            table.add_column("Downloadable", style="yellow")
+
+            # Add all rows to the table
             for row in data_rows:
-                for i, cell in enumerate(row):
-                    max_widths[i] = max(max_widths[i], len(str(cell)))
-            
-            # Add some padding
-            max_widths = [w + 2 for w in max_widths]
-            
-            return data_rows, max_widths
-        
-        data_rows, column_widths = calculate_column_widths()
-        
-        # Create table with dynamic widths
-        table = Table(show_header=True, header_style="bold cyan", border_style="blue")
-        table.add_column("Type", style="cyan bold", width=column_widths[0])
-        table.add_column("Available", style="green", width=column_widths[1])
-        table.add_column("Set", style="red", width=column_widths[2])
-        table.add_column("Downloadable", style="yellow", width=column_widths[3])
-        
-        # Add all rows to the table
-        for row in data_rows:
-            table.add_row(*row)
+                table.add_row(*row)
+
+            rendered_table = Segments(list(console.render(table)))
+            _TABLE_CACHE[cache_key] = rendered_table
 
         console.print("[cyan]You can safely stop the download with [bold]Ctrl+c[bold] [cyan]")
-        console.print(table)
+        console.print(rendered_table)
         console.print("")
 
-    def get_representation_by_type(self, typ):
+    @property
+    def video_rep(self):
+        """Representation of the selected video stream."""
+        return self.selected_video
+
+    @property
+    def audio_rep(self):
+        """Representation of the selected audio stream."""
+        return self.selected_audio
+
+    async def _download_subtitles_async(self) -> bool:
         """
-        Get the representation of the selected stream by type.
+        Fetch all subtitle files concurrently over a single keep-alive client,
+        streaming each body to disk chunk by chunk.
         """
-        if typ == "video":
-            return getattr(self, "selected_video", None)
-        elif typ == "audio":
-            return getattr(self, "selected_audio", None)
-        return None
+        # HTTP/1.1 keep-alive: httpx's http2=True needs the optional h2
+        # package, which requirements.txt does not ship
+        async with create_async_client(headers={'User-Agent': get_userAgent()}) as client:
+
+            async def fetch_single(sub):
+                language = sub.get('language', 'unknown')
+                fmt = sub.get('format', 'vtt')
+                sub_path = os.path.join(self.subs_dir, f"{language}.{fmt}")
+
+                # Coalesce small chunks into a pooled 64 KiB buffer before each write
+                buf = _get_buffer()
+                pos = 0
+
+                # Stream into a .part file and rename once complete, so a
+                # mid-stream failure never leaves a truncated subtitle that
+                # the merge would later pick up as a valid input
+                part_path = f"{sub_path}.part"
+
+                try:
+                    async with client.stream("GET", sub.get('url')) as response:
+
+                        # Plain status check: no exception object on the happy path
+                        if response.status_code >= 400:
+                            return f"HTTP {response.status_code}"
+
+                        with open(part_path, 'wb') as f:
+                            async for chunk in response.aiter_raw(SUB_CHUNK_SIZE):
+                                if pos + len(chunk) > SUB_CHUNK_SIZE:
+                                    f.write(memoryview(buf)[:pos])
+                                    pos = 0
+
+                                if len(chunk) >= SUB_CHUNK_SIZE:
+                                    f.write(chunk)
+                                else:
+                                    buf[pos:pos + len(chunk)] = chunk
+                                    pos += len(chunk)
+
+                            if pos:
+                                f.write(memoryview(buf)[:pos])
+
+                    os.replace(part_path, sub_path)
+
+                except Exception:
+                    try:
+                        os.remove(part_path)
+                    except OSError:
+                        pass
+                    raise
+
+                finally:
+                    _BUF_POOL.put(buf)
+
+                return None
+
+            tasks = [fetch_single(sub) for sub in self.selected_subs]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Failures (HTTP errors or transport exceptions) are reported after the batch
+        failures = [
+            (sub.get('language', 'unknown'), result)
+            for sub, result in zip(self.selected_subs, results)
+            if result is not None
+        ]
+
+        for language, reason in failures:
+            console.print(f"[red]Error downloading subtitle {language}: {reason}[/red]")
+
+        return not failures
 
     def download_subtitles(self) -> bool:
         """
-        Download subtitle files based on configuration with retry mechanism.
+        Download subtitle files based on configuration.
         Returns True if successful or if no subtitles to download, False on critical error.
         """
-        client = create_client(headers={'User-Agent': get_userAgent()})
-        
-        for sub in self.selected_subs:
-            try:
-                language = sub.get('language', 'unknown')
-                fmt = sub.get('format', 'vtt')
+        if not self.selected_subs:
+            return True
 
-                # Download subtitle
-                response = client.get(sub.get('url'))
-                response.raise_for_status()
-                
-                # Save subtitle file and make request
-                sub_filename = f"{language}.{fmt}"
-                sub_path = os.path.join(self.subs_dir, sub_filename)
-                
-                with open(sub_path, 'wb') as f:
-                    f.write(response.content)
-                    
-            except Exception as e:
-                console.print(f"[red]Error downloading subtitle {language}: {e}[/red]")
-                return False
-            
-        return True
+        return asyncio.run(self._download_subtitles_async())
 
     def download_and_decrypt(self, custom_headers=None, custom_payload=None):
         """
@@ -259,124 +412,152 @@ class DASH_Downloader:
         KID = key['kid']
         KEY = key['key']
 
-        # Download subtitles
-        self.download_subtitles()
+        # One worker for mp4decrypt (CPU-bound child process) and one for the
+        # subtitle batch, so both overlap with the segment downloads
+        background_pool = ThreadPoolExecutor(max_workers=2)
+        video_decrypt_future = None
 
-        # Download the video to get segment count
-        video_rep = self.get_representation_by_type("video")
-        if video_rep:
-            encrypted_path = os.path.join(self.encrypted_dir, f"{video_rep['id']}_encrypted.m4s")
+        # Keys are validated at this point: start subtitles in the background,
+        # they are an independent network stream
+        subs_future = background_pool.submit(self.download_subtitles)
+        try:
 
-            # If m4s file doesn't exist, start downloading
-            if not os.path.exists(encrypted_path):
-                video_downloader = MPD_Segments(
-                    tmp_folder=self.encrypted_dir,
-                    representation=video_rep,
-                    pssh=self.parser.pssh
-                )
+            # Download the video to get segment count
+            video_rep = self.video_rep
+            if video_rep:
+                encrypted_path = os.path.join(self.encrypted_dir, f"{video_rep['id']}_encrypted.m4s")
+
+                # If m4s file doesn't exist, start downloading
+                if not os.path.exists(encrypted_path):
+                    video_downloader = MPD_Segments(
+                        tmp_folder=self.encrypted_dir,
+                        representation=video_rep,
+                        pssh=self.parser.pssh
+                    )
 
-                # Set current downloader for progress tracking
-                self.current_downloader = video_downloader
-                self.current_download_type = 'video'
+                    # Set current downloader for progress tracking
+                    self.current_downloader = video_downloader
+                    self.current_download_type = 'video'
 
-                try:
-                    result = video_downloader.download_streams(description="Video")
+                    try:
+                        result = video_downloader.download_streams(description="Video")
                     
-                    # Store the video segment count for limiting audio
-                    video_segments_count = video_downloader.get_segments_count()
-
-                    # Check for interruption or failure
-                    if result.get("stopped"):
-                        self.stopped = True
-                        self.error = "Download interrupted"
-                        return False
+                        # Store the video segment count for limiting audio
+                        video_segments_count = video_downloader.get_segments_count()
+
+                        # Check for interruption or failure
+                        if result.get("stopped"):
+                            self.stopped = True
+                            self.error = "Download interrupted"
+                            return False
                     
-                    if result.get("nFailed", 0) > 0:
-                        self.error = f"Failed segments: {result['nFailed']}"
-                        return False
+                        if result.get("nFailed", 0) > 0:
+                            self.error = f"Failed segments: {result['nFailed']}"
+                            return False
                     
-                except Exception as ex:
-                    self.error = str(ex)
-                    return False
+                    except Exception as ex:
+                        self.error = str(ex)
+                        return False
                 
-                finally:
-                    self.current_downloader = None
-                    self.current_download_type = None
-
-                # Decrypt video
-                decrypted_path = os.path.join(self.decrypted_dir, f"video.{extension_output}")
-                result_path = decrypt_with_mp4decrypt(
-                    "Video", encrypted_path, KID, KEY, output_path=decrypted_path
-                )
-
-                if not result_path:
-                    self.error = "Decryption of video failed"
-                    print(self.error)
-                    return False
+                    finally:
+                        self.current_downloader = None
+                        self.current_download_type = None
+
+                    # Start video decryption in the background while audio downloads
+                    decrypted_path = os.path.join(self.decrypted_dir, f"video.{EXTENSION_OUTPUT}")
+                    video_decrypt_future = background_pool.submit(
+                        decrypt_with_mp4decrypt, "Video", encrypted_path, KID, KEY, decrypted_path
+                    )
 
-        else:
-            self.error = "No video found"
-            print(self.error)
-            return False
+            else:
+                self.error = "No video found"
+                print(self.error)
+                return False
             
-        # Now download audio with segment limiting
-        audio_rep = self.get_representation_by_type("audio")
-        if audio_rep:
-            encrypted_path = os.path.join(self.encrypted_dir, f"{audio_rep['id']}_encrypted.m4s")
-
-            # If m4s file doesn't exist, start downloading
-            if not os.path.exists(encrypted_path):
-                audio_language = audio_rep.get('language', 'Unknown')
+            # Now download audio with segment limiting
+            audio_rep = self.audio_rep
+            if audio_rep:
+                encrypted_path = os.path.join(self.encrypted_dir, f"{audio_rep['id']}_encrypted.m4s")
+
+                # If m4s file doesn't exist, start downloading
+                if not os.path.exists(encrypted_path):
+                    audio_language = audio_rep.get('language', 'Unknown')
                 
-                audio_downloader = MPD_Segments(
-                    tmp_folder=self.encrypted_dir,
-                    representation=audio_rep,
-                    pssh=self.parser.pssh,
-                    limit_segments=video_segments_count if video_segments_count > 0 else None
-                )
+                    audio_downloader = MPD_Segments(
+                        tmp_folder=self.encrypted_dir,
+                        representation=audio_rep,
+                        pssh=self.parser.pssh,
+                        limit_segments=video_segments_count if video_segments_count > 0 else None
+                    )
 
-                # Set current downloader for progress tracking
-                self.current_downloader = audio_downloader
-                self.current_download_type = f"audio_{audio_language}"
+                    # Set current downloader for progress tracking
+                    self.current_downloader = audio_downloader
+                    self.current_download_type = f"audio_{audio_language}"
 
-                try:
-                    result = audio_downloader.download_streams(description=f"Audio {audio_language}")
+                    try:
+                        result = audio_downloader.download_streams(description=f"Audio {audio_language}")
 
-                    # Check for interruption or failure
-                    if result.get("stopped"):
-                        self.stopped = True
-                        self.error = "Download interrupted"
-                        return False
+                        # Check for interruption or failure
+                        if result.get("stopped"):
+                            self.stopped = True
+                            self.error = "Download interrupted"
+                            return False
                     
-                    if result.get("nFailed", 0) > 0:
-                        self.error = f"Failed segments: {result['nFailed']}"
-                        return False
+                        if result.get("nFailed", 0) > 0:
+                            self.error = f"Failed segments: {result['nFailed']}"
+                            return False
                     
-                except Exception as ex:
-                    self.error = str(ex)
-                    return False
+                    except Exception as ex:
+                        self.error = str(ex)
+                        return False
                 
-                finally:
-                    self.current_downloader = None
-                    self.current_download_type = None
+                    finally:
+                        self.current_downloader = None
+                        self.current_download_type = None
+
+                    # Wait for the background video decryption before decrypting audio
+                    if video_decrypt_future is not None:
+                        if not video_decrypt_future.result():
+                            self.error = "Decryption of video failed"
+                            print(self.error)
+                            return False
+                        video_decrypt_future = None
+
+                    # Decrypt audio
+                    decrypted_path = os.path.join(self.decrypted_dir, f"audio.{EXTENSION_OUTPUT}")
+                    result_path = decrypt_with_mp4decrypt(
+                        f"Audio {audio_language}", encrypted_path, KID, KEY, output_path=decrypted_path
+                    )
 
-                # Decrypt audio
-                decrypted_path = os.path.join(self.decrypted_dir, f"audio.{extension_output}")
-                result_path = decrypt_with_mp4decrypt(
-                    f"Audio {audio_language}", encrypted_path, KID, KEY, output_path=decrypted_path
-                )
+                    if not result_path:
+                        self.error = "Decryption of audio failed"
+                        print(self.error)
+                        return False
 
-                if not result_path:
-                    self.error = "Decryption of audio failed"
-                    print(self.error)
-                    return False
+            else:
+                self.error = "No audio found"
+                print(self.error)
+                return False
 
-        else:
-            self.error = "No audio found"
-            print(self.error)
-            return False
+            # Video decryption is still pending when the audio step was skipped
+            if video_decrypt_future is not None and not video_decrypt_future.result():
+                self.error = "Decryption of video failed"
+                print(self.error)
+                return False
 
-        return True
+            # Make sure the subtitle batch has landed before finalize runs;
+            # a failure there only costs subtitles, not the whole download
+            try:
+                subs_future.result()
+            except Exception as e:
+                console.print(f"[yellow]Warning: Failed to download subtitles: {e}[/yellow]")
+
+            return True
+
+        finally:
+            # Early returns (stop, failed segments, decrypt failure) must
+            # not leak the workers or leave background futures running
+            background_pool.shutdown(wait=False, cancel_futures=True)
 
     def download_segments(self, clear=False):
         """
@@ -395,7 +576,7 @@ class DASH_Downloader:
         self.download_subtitles()
         
         # Download video
-        video_rep = self.get_representation_by_type("video")
+        video_rep = self.video_rep
         if video_rep:
             encrypted_path = os.path.join(self.encrypted_dir, f"{video_rep['id']}_encrypted.m4s")
             
@@ -437,9 +618,9 @@ class DASH_Downloader:
                     self.current_download_type = None
             
             # NO DECRYPTION: just copy/move to decrypted folder
-            decrypted_path = os.path.join(self.decrypted_dir, f"video.{extension_output}")
+            decrypted_path = os.path.join(self.decrypted_dir, f"video.{EXTENSION_OUTPUT}")
             if os.path.exists(encrypted_path) and not os.path.exists(decrypted_path):
-                shutil.copy2(encrypted_path, decrypted_path)
+                _fast_link(encrypted_path, decrypted_path)
 
         else:
             self.error = "No video found"
@@ -447,7 +628,7 @@ class DASH_Downloader:
             return False
         
         # Download audio with segment limiting
-        audio_rep = self.get_representation_by_type("audio")
+        audio_rep = self.audio_rep
         if audio_rep:
             encrypted_path = os.path.join(self.encrypted_dir, f"{audio_rep['id']}_encrypted.m4s")
             
@@ -489,9 +670,9 @@ class DASH_Downloader:
                     self.current_download_type = None
             
             # NO DECRYPTION: just copy/move to decrypted folder
-            decrypted_path = os.path.join(self.decrypted_dir, f"audio.{extension_output}")
+            decrypted_path = os.path.join(self.decrypted_dir, f"audio.{EXTENSION_OUTPUT}")
             if os.path.exists(encrypted_path) and not os.path.exists(decrypted_path):
-                shutil.copy2(encrypted_path, decrypted_path)
+                _fast_link(encrypted_path, decrypted_path)
                 
         else:
             self.error = "No audio found"
@@ -510,71 +691,99 @@ class DASH_Downloader:
             return output_file
         
         # Definition of decrypted files
-        video_file = os.path.join(self.decrypted_dir, f"video.{extension_output}")
-        audio_file = os.path.join(self.decrypted_dir, f"audio.{extension_output}")
+        video_file = os.path.join(self.decrypted_dir, f"video.{EXTENSION_OUTPUT}")
+        audio_file = os.path.join(self.decrypted_dir, f"audio.{EXTENSION_OUTPUT}")
         output_file = self.original_output_path
         
         # Set the output file path for status tracking
         self.output_file = output_file
         use_shortest = False
 
-        # Merge video and audio
-        if os.path.exists(video_file) and os.path.exists(audio_file):
+        # Single scan of decrypted_dir instead of one stat per file
+        decrypted_names = {entry.name for entry in os.scandir(self.decrypted_dir)} if os.path.isdir(self.decrypted_dir) else set()
+        has_video = f"video.{EXTENSION_OUTPUT}" in decrypted_names
+        has_audio = f"audio.{EXTENSION_OUTPUT}" in decrypted_names
+
+        if not has_video:
+            console.print("[red]Video file missing, cannot export[/red]")
+            return None
+
+        # Check which subtitle files actually exist with one scan of subs_dir
+        existing_sub_tracks = []
+        if MERGE_SUBTITLE and self._sub_paths:
+            subs_names = {entry.name for entry in os.scandir(self.subs_dir)} if os.path.isdir(self.subs_dir) else set()
+
+            existing_sub_tracks = [
+                {'path': path, 'language': language}
+                for path, language in zip(self._sub_paths, self._sub_langs)
+                if os.path.basename(path) in subs_names
+            ]
+
+        # Merge everything in a single ffmpeg pass when possible, so the
+        # container is not read and rewritten a second time for subtitles
+        if has_audio and existing_sub_tracks:
+            audio_tracks = [{"path": audio_file}]
+            merged_file, use_shortest = join_av_and_subs(video_file, audio_tracks, existing_sub_tracks, output_file)
+
+            # Fall back to the two-step chain if the fused pass failed: one
+            # bad subtitle input must only cost subtitles, never the output
+            # that the tmp cleanup below would otherwise leave nothing of
+            if not os.path.exists(merged_file):
+                merged_file, use_shortest = join_audios(video_file, audio_tracks, output_file)
+
+                if os.path.exists(merged_file):
+                    temp_output = f"{self.out_path}_temp.{EXTENSION_OUTPUT}"
+
+                    try:
+                        final_file = join_subtitle(
+                            video_path=merged_file,
+                            subtitles_list=existing_sub_tracks,
+                            out_path=temp_output
+                        )
+
+                        # Replace original with subtitled version (atomic rename-over)
+                        if os.path.exists(final_file):
+                            os.replace(final_file, output_file)
+                            merged_file = output_file
+
+                    except Exception as e:
+                        console.print(f"[yellow]Warning: Failed to merge subtitles: {e}[/yellow]")
+
+        elif has_audio:
             audio_tracks = [{"path": audio_file}]
             merged_file, use_shortest = join_audios(video_file, audio_tracks, output_file)
-            
-        elif os.path.exists(video_file):
-            merged_file = join_video(video_file, output_file, codec=None)
-            
+
         else:
-            console.print("[red]Video file missing, cannot export[/red]")
-            return None
-        
-        # Merge subtitles if available
-        if MERGE_SUBTITLE and self.selected_subs:
+            merged_file = join_video(video_file, output_file, codec=None, is_final=not existing_sub_tracks)
 
-            # Check which subtitle files actually exist
-            existing_sub_tracks = []
-            for sub in self.selected_subs:
-                language = sub.get('language', 'unknown')
-                fmt = sub.get('format', 'vtt')
-                sub_path = os.path.join(self.subs_dir, f"{language}.{fmt}")
-                
-                if os.path.exists(sub_path):
-                    existing_sub_tracks.append({
-                        'path': sub_path,
-                        'language': language
-                    })
-            
+            # Video-only stream: subtitles still need their own merge pass
             if existing_sub_tracks:
+                temp_output = f"{self.out_path}_temp.{EXTENSION_OUTPUT}"
 
-                # Create temporary file for subtitle merge
-                temp_output = output_file.replace(f'.{extension_output}', f'_temp.{extension_output}')
-                
                 try:
                     final_file = join_subtitle(
                         video_path=merged_file,
                         subtitles_list=existing_sub_tracks,
                         out_path=temp_output
                     )
-                    
-                    # Replace original with subtitled version
+
+                    # Replace original with subtitled version (atomic rename-over)
                     if os.path.exists(final_file):
-                        if os.path.exists(output_file):
-                            os.remove(output_file)
-                        os.rename(final_file, output_file)
+                        os.replace(final_file, output_file)
                         merged_file = output_file
-                        
+
                 except Exception as e:
                     console.print(f"[yellow]Warning: Failed to merge subtitles: {e}[/yellow]")
-        
+
         # Handle failed sync case
         if use_shortest:
             new_filename = output_file.replace(EXTENSION_OUTPUT, f"_failed_sync.{EXTENSION_OUTPUT}")
-            if os.path.exists(output_file):
-                os.rename(output_file, new_filename)
+            try:
+                os.replace(output_file, new_filename)
                 output_file = new_filename
                 self.output_file = new_filename
+            except FileNotFoundError:
+                pass
 
         # Display file information
         if os.path.exists(output_file):
@@ -620,15 +829,12 @@ class DASH_Downloader:
     
     def get_progress_data(self) -> Optional[Dict]:
         """Get current download progress data."""
-        if not self.current_downloader:
+        # Grab one reference: current_downloader may be cleared by the worker
+        downloader = self.current_downloader
+        if not downloader:
             return None
 
-        try:
-            progress = self.current_downloader.get_progress_data()
-            if progress:
-                progress['download_type'] = self.current_download_type
-            return progress
-            
-        except Exception as e:
-            logging.error(f"Error getting progress data: {e}")
-            return None
\ No newline at end of file
+        progress = downloader.get_progress_data()
+        if progress:
+            progress['download_type'] = self.current_download_type
+        return progress
\ No newline at end of file
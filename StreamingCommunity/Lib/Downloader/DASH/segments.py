@@ -2,6 +2,7 @@
 
 import os
 import asyncio
+import multiprocessing
 import time
 from typing import Dict, Optional
 
@@ -19,6 +20,10 @@ from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.color import Colors
 
 
+# Logic class
+from .uring_writer import UringWriter
+
+
 # Config
 REQUEST_MAX_RETRY = config_manager.get_int('REQUESTS', 'max_retry')
 DEFAULT_VIDEO_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'default_video_workers')
@@ -73,6 +78,13 @@ class MPD_Segments:
         # Estimator for progress tracking
         self.estimator: Optional[M3U8_Ts_Estimator] = None
 
+        # Batched small-file writer (io_uring on Linux when available)
+        self.file_writer = UringWriter()
+
+        # Lock-free progress snapshot [downloaded, total, bytes]: written by the
+        # download loop, read directly by UI pollers without locks
+        self.progress_snapshot = multiprocessing.RawArray('q', 3)
+
     def get_concat_path(self, output_dir: str = None):
         """
         Get the path for the concatenated output file.
@@ -163,6 +175,10 @@ class MPD_Segments:
         self.info_nRetry = 0
         self.info_maxRetry = 0
 
+        self.progress_snapshot[0] = 0
+        self.progress_snapshot[1] = len(segment_urls)
+        self.progress_snapshot[2] = 0
+
         try:
             timeout_config = httpx.Timeout(SEGMENT_MAX_TIMEOUT, connect=10.0)
             limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
@@ -253,9 +269,8 @@ class MPD_Segments:
                         # Write directly to temp file
                         if resp.status_code == 200:
                             content_size = len(resp.content)
-                            with open(temp_file, 'wb') as f:
-                                f.write(resp.content)
-                            
+                            self.file_writer.write_file(temp_file, resp.content)
+
                             # Update status
                             async with self.segments_lock:
                                 self.segment_status[idx] = {'downloaded': True, 'size': content_size}
@@ -294,6 +309,8 @@ class MPD_Segments:
                 self.info_nRetry += nretry
                     
                 progress_bar.update(1)
+                self.progress_snapshot[0] = len(self.downloaded_segments)
+                self.progress_snapshot[2] += size
                 if self.estimator:
                     self.estimator.add_ts_file(size)
                     self._throttled_progress_update(size, progress_bar)
@@ -331,9 +348,8 @@ class MPD_Segments:
                             # Write directly to temp file
                             if resp.status_code == 200:
                                 content_size = len(resp.content)
-                                with open(temp_file, 'wb') as f:
-                                    f.write(resp.content)
-                                
+                                self.file_writer.write_file(temp_file, resp.content)
+
                                 async with self.segments_lock:
                                     self.segment_status[idx] = {'downloaded': True, 'size': content_size}
                                     self.downloaded_segments.add(idx)
@@ -362,6 +378,8 @@ class MPD_Segments:
                     self.info_nRetry += nretry
                     
                     progress_bar.update(0)
+                    self.progress_snapshot[0] = len(self.downloaded_segments)
+                    self.progress_snapshot[2] += size
                     if self.estimator:
                         self.estimator.add_ts_file(size)
                         self._throttled_progress_update(size, progress_bar)
@@ -378,6 +396,9 @@ class MPD_Segments:
         """
         Concatenate all segment files IN ORDER to the final output file.
         """
+        # Make sure every batched write has landed on disk before reading back
+        self.file_writer.flush()
+
         with open(concat_path, 'ab') as outfile:
             for idx in range(total_segments):
                 temp_file = os.path.join(temp_dir, f"seg_{idx:06d}.tmp")
@@ -454,6 +475,7 @@ class MPD_Segments:
         Ensure resource cleanup and final reporting.
         """
         progress_bar.close()
+        self.file_writer.close()
         
         # Delete temp segment files
         if temp_dir and os.path.exists(temp_dir):
@@ -489,9 +511,9 @@ class MPD_Segments:
         """Returns current download progress data for API."""
         if not self.estimator:
             return None
-            
-        total = self.get_segments_count()
-        downloaded = len(self.downloaded_segments)
+
+        # Read the lock-free snapshot instead of walking downloaded_segments
+        downloaded, total, _ = self.progress_snapshot
         percentage = (downloaded / total * 100) if total > 0 else 0
         stats = self.estimator.get_stats(downloaded, total)
         
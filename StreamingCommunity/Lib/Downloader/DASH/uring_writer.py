@@ -0,0 +1,113 @@
+# 25.07.25
+
+import os
+import sys
+import logging
+
+
+# Optional liburing support (Linux only). When the binding is not installed
+# we transparently fall back to regular synchronous writes.
+HAS_LIBURING = False
+if sys.platform == "linux":
+    try:
+        import liburing
+        HAS_LIBURING = True
+    except ImportError:
+        pass
+
+
+class UringWriter:
+    """
+    Small-file writer that batches writes through io_uring on Linux.
+
+    Writes queued with write_file() are submitted as a single batch of SQEs
+    (one io_uring_enter for the whole batch) when the queue fills up or when
+    flush() is called. On non-Linux platforms, or when liburing is not
+    installed, every write_file() call degrades to a plain open()/write().
+    """
+
+    QUEUE_DEPTH = 64
+
+    def __init__(self):
+        self._ring = None
+        self._pending = []
+
+        if HAS_LIBURING:
+            try:
+                self._ring = liburing.io_uring()
+                liburing.io_uring_queue_init(self.QUEUE_DEPTH, self._ring)
+            except Exception as e:
+                logging.info(f"io_uring unavailable, falling back to sync writes: {e}")
+                self._ring = None
+
+    def write_file(self, path: str, data: bytes):
+        """
+        Queue the full content of a small file for writing.
+        """
+        if self._ring is None:
+            with open(path, 'wb') as f:
+                f.write(data)
+            return
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._pending.append((fd, data))
+
+        if len(self._pending) >= self.QUEUE_DEPTH:
+            self.flush()
+
+    def flush(self):
+        """
+        Submit every queued write in one batch and wait for all completions.
+        """
+        if self._ring is None or not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        buffers = []
+
+        try:
+            for idx, (fd, data) in enumerate(pending):
+                sqe = liburing.io_uring_get_sqe(self._ring)
+                buf = bytearray(data)
+                buffers.append(buf)
+                liburing.io_uring_prep_write(sqe, fd, buf, len(buf), 0)
+                sqe.user_data = idx
+
+            # Single syscall for the whole batch
+            liburing.io_uring_submit_and_wait(self._ring, len(pending))
+
+            cqe = liburing.io_uring_cqe()
+            for _ in range(len(pending)):
+                liburing.io_uring_wait_cqe(self._ring, cqe)
+                idx = cqe.user_data
+                res = cqe.res
+                liburing.io_uring_cqe_seen(self._ring, cqe)
+
+                # Errors (negative res) and short writes must not pass
+                # silently: the segment would be concatenated half-written.
+                # Finish the file synchronously so a real failure (ENOSPC,
+                # EIO) surfaces as OSError, like the sync fallback path
+                fd, data = pending[idx]
+                if res < 0:
+                    logging.error(f"io_uring write failed (res={res}) for fd {fd}, rewriting synchronously")
+
+                written = max(res, 0)
+                while written < len(data):
+                    written += os.pwrite(fd, data[written:], written)
+
+        finally:
+            for fd, _ in pending:
+                os.close(fd)
+
+    def close(self):
+        """
+        Flush outstanding writes and release the ring.
+        """
+        self.flush()
+
+        if self._ring is not None:
+            try:
+                liburing.io_uring_queue_exit(self._ring)
+            except Exception:
+                pass
+            self._ring = None
@@ -1,20 +1,22 @@
 # 17.10.24
 
 import os
+import re
 import logging
 import shutil
+import socket
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional, Union
 
 
-# External libraries
-from rich.console import Console
-from rich.table import Table
-
-
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.http_client import fetch
+from StreamingCommunity.Util.http_client import create_client, _sleep_with_backoff
 from StreamingCommunity.Util.os import os_manager, internet_manager
 
 
@@ -23,22 +25,122 @@ from ...FFmpeg import (
     print_duration_table,
     join_video,
     join_audios,
-    join_subtitle
+    join_subtitle,
+    join_av_and_subs,
+    get_last_run_stats
 )
 from ...M3U8 import M3U8_Parser, M3U8_UrlFix
 from .segments import M3U8_Segments
 
 
 # Config
-DOWNLOAD_SPECIFIC_AUDIO = config_manager.get_list('M3U8_DOWNLOAD', 'specific_list_audio')
-DOWNLOAD_SPECIFIC_SUBTITLE = config_manager.get_list('M3U8_DOWNLOAD', 'specific_list_subtitles')
+# Frozensets make the per-track language membership tests O(1)
+DOWNLOAD_SPECIFIC_AUDIO = frozenset(config_manager.get_list('M3U8_DOWNLOAD', 'specific_list_audio'))
+DOWNLOAD_SPECIFIC_SUBTITLE = frozenset(config_manager.get_list('M3U8_DOWNLOAD', 'specific_list_subtitles'))
 MERGE_SUBTITLE = config_manager.get_bool('M3U8_DOWNLOAD', 'merge_subs')
 CLEANUP_TMP = config_manager.get_bool('M3U8_DOWNLOAD', 'cleanup_tmp_folder')
 GET_ONLY_LINK = config_manager.get_int('M3U8_DOWNLOAD', 'get_only_link')
 FILTER_CUSTOM_RESOLUTION = str(config_manager.get('M3U8_CONVERSION', 'force_resolution')).strip().lower()
+
+# The resolution override never changes at runtime, so classify it once here
+# instead of re-running the replace/isdigit chain on every selection
+_FCR_DIGITS = FILTER_CUSTOM_RESOLUTION.replace("p", "").replace("px", "")
+if FILTER_CUSTOM_RESOLUTION in ("best", "worst"):
+    _FCR_MODE = FILTER_CUSTOM_RESOLUTION
+elif _FCR_DIGITS.isdigit():
+    _FCR_MODE = "custom"
+else:
+    _FCR_MODE = "invalid"
+_FCR_VALUE = int(_FCR_DIGITS) if _FCR_MODE == "custom" else None
 EXTENSION_OUTPUT = config_manager.get("M3U8_CONVERSION", "extension")
+_EXT_LEN = len(EXTENSION_OUTPUT)
+REQUEST_MAX_RETRY = config_manager.get_int('REQUESTS', 'max_retry')
+
+class _LazyConsole:
+    """Defers the rich import until the first print: link-extraction runs
+    (GET_ONLY_LINK) and library users skip the whole rich import chain."""
+    _console = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
+
+# Raw playlist content keyed by URL with a short TTL: retries and batch runs
+# against the same master playlist skip refetching identical bytes
+_M3U8_CACHE: Dict[str, tuple] = {}
+_M3U8_CACHE_TTL = 300
+
+# Resolved addresses keyed by hostname: warming getaddrinfo once per host
+# primes the OS resolver cache so the many segment requests that follow do
+# not each stall on a DNS lookup
+_DNS_CACHE: Dict[str, tuple] = {}
+_DNS_CACHE_TTL = 900
+
+# Compact record behind every start() response: one definition instead of a
+# six-key dict literal per return path
+DownloadResult = namedtuple('DownloadResult', ['path', 'url', 'is_master', 'msg', 'error', 'stopped'])
+
+# Matches non-comment VTT lines in a subtitle media playlist; extracting the
+# URI directly is much cheaper than running the full M3U8 parser per language.
+# Like the parser's classification, any URI containing 'vtt' qualifies
+# (.webvtt segments, ?fmt=vtt query forms), not just a literal .vtt suffix
+_VTT_LINE_RE = re.compile(r'(?m)^(?!#)(\S*vtt\S*)\s*$')
+
+
+def _format_ffmpeg_time(time_str: Optional[str]) -> Optional[str]:
+    """Converts ffmpeg's HH:MM:SS progress time into the summary's duration markup."""
+    if not time_str:
+        return None
+
+    try:
+        # ffmpeg reports time= as HH:MM:SS.cc, so the seconds are fractional
+        hours, minutes, seconds = time_str.split(':')
+        hours, minutes, seconds = int(hours), int(minutes), int(float(seconds))
+    except ValueError:
+        return None
+
+    return f"[yellow]{hours}[red]h [yellow]{minutes}[red]m [yellow]{seconds}[red]s"
+
+
+def _scan_temp_tree(temp_dir: str) -> set:
+    """One walk of the temp subtrees instead of a stat per expected file."""
+    existing = set()
+
+    for subdir in ['video', 'subs']:
+        subdir_path = os.path.join(temp_dir, subdir)
+        if os.path.isdir(subdir_path):
+            existing.update(entry.path for entry in os.scandir(subdir_path))
 
-console = Console()
+    audio_root = os.path.join(temp_dir, 'audio')
+    if os.path.isdir(audio_root):
+        for lang_dir in os.scandir(audio_root):
+            if lang_dir.is_dir():
+                existing.update(entry.path for entry in os.scandir(lang_dir.path))
+
+    return existing
+
+
+def _warm_dns(url: str) -> None:
+    """Resolves the URL's hostname once and caches the result for 15 minutes."""
+    hostname = urlparse(url).hostname
+    if not hostname:
+        return
+
+    now = time.monotonic()
+    cached = _DNS_CACHE.get(hostname)
+    if cached and now - cached[0] < _DNS_CACHE_TTL:
+        return
+
+    try:
+        addrinfo = socket.getaddrinfo(hostname, 443, proto=socket.IPPROTO_TCP)
+        _DNS_CACHE[hostname] = (now, addrinfo)
+    except socket.gaierror:
+        pass
 
 
 class HLSClient:
@@ -46,9 +148,14 @@ class HLSClient:
     def __init__(self, custom_headers: Optional[Dict[str, str]] = None):
         self.headers = custom_headers if custom_headers else {'User-Agent': get_userAgent()}
 
+        # One keep-alive client for the whole download: the playlist, subtitle
+        # playlists and VTT files all live on the same few hosts, so reusing
+        # pooled connections avoids a TCP+TLS handshake per request
+        self.session = create_client(headers=self.headers)
+
     def request(self, url: str, return_content: bool = False) -> Optional[Union[str, bytes]]:
         """
-        Makes HTTP GET requests with retry logic using http_client.
+        Makes HTTP GET requests with retry logic over the shared client.
 
         Args:
             url: Target URL to request
@@ -62,12 +169,55 @@ class HLSClient:
             logging.error("URL is None or empty, cannot make request")
             return None
 
-        return fetch(
-            url,
-            method="GET",
-            headers=self.headers,
-            return_content=return_content
-        )
+        for attempt in range(REQUEST_MAX_RETRY):
+            try:
+                response = self.session.get(url)
+                response.raise_for_status()
+                return response.content if return_content else response.text
+
+            except Exception:
+                if attempt + 1 >= REQUEST_MAX_RETRY:
+                    break
+                _sleep_with_backoff(attempt)
+
+        return None
+
+    def download_to_file(self, url: str, path: str) -> bool:
+        """
+        Streams a GET response straight to disk in 256 KiB chunks, so large
+        files are never materialized in memory.
+
+        Returns:
+            True on success, False if all retries fail
+        """
+        if not url:
+            logging.error("URL is None or empty, cannot make request")
+            return False
+
+        for attempt in range(REQUEST_MAX_RETRY):
+            try:
+                with self.session.stream("GET", url) as response:
+                    response.raise_for_status()
+
+                    with open(path, 'wb', buffering=262144) as f:
+                        for chunk in response.iter_bytes(262144):
+                            f.write(chunk)
+
+                return True
+
+            except Exception:
+                if attempt + 1 >= REQUEST_MAX_RETRY:
+                    break
+                _sleep_with_backoff(attempt)
+
+        return False
+
+    def close(self):
+        """Closes the underlying connection pool."""
+        try:
+            self.session.close()
+        except Exception:
+            pass
 
 
 class PathManager:
@@ -80,9 +230,13 @@ class PathManager:
         """
         self.m3u8_url = m3u8_url
         self.output_path = self._sanitize_output_path(output_path)
-        base_name = os.path.basename(self.output_path).replace(EXTENSION_OUTPUT, "")
+        base_name = os.path.splitext(os.path.basename(self.output_path))[0]
         self.temp_dir = os.path.join(os.path.dirname(self.output_path), f"{base_name}_tmp")
 
+        # Temp files known to exist, filled by one scan in setup_directories so
+        # download/merge do set membership instead of a stat per file
+        self._existing_files: set = set()
+
     def _sanitize_output_path(self, path: Optional[str]) -> str:
         """
         Ensures output path is valid and follows expected format.
@@ -100,13 +254,33 @@ class PathManager:
         """Creates necessary directories for temporary files (video, audio, subtitles)."""
         os.makedirs(self.temp_dir, exist_ok=True)
         for subdir in ['video', 'audio', 'subs']:
-            os.makedirs(os.path.join(self.temp_dir, subdir), exist_ok=True)
+            try:
+                os.mkdir(os.path.join(self.temp_dir, subdir))
+            except FileExistsError:
+                pass
+
+        self._existing_files = self._scan_temp_files()
+
+    def _scan_temp_files(self) -> set:
+        """One walk of the temp subtrees instead of a stat per expected file."""
+        return _scan_temp_tree(self.temp_dir)
+
+    def has_file(self, path: str) -> bool:
+        """Membership test against the cached scan."""
+        return path in self._existing_files
+
+    def mark_file(self, path: str):
+        """Records a file created after the initial scan."""
+        self._existing_files.add(path)
 
     def move_final_file(self, final_file: str):
         """Moves the final merged file to the desired output location."""
-        if os.path.exists(self.output_path):
-            os.remove(self.output_path)
-        shutil.move(final_file, self.output_path)
+        # os.replace is one atomic rename and overwrites any stale output;
+        # shutil.move only remains as the cross-filesystem fallback
+        try:
+            os.replace(final_file, self.output_path)
+        except OSError:
+            shutil.move(final_file, self.output_path)
 
     def cleanup(self):
         """Removes temporary directories if configured to do so."""
@@ -127,6 +301,14 @@ class M3U8Manager:
         self.sub_streams = []
         self.is_master = False
 
+        # Parser stream lists fetched once in select_streams and reused by
+        # log_selection instead of re-walking the parser tables
+        self.all_audio: List[Dict] = []
+        self.all_sub: List[Dict] = []
+
+        # Raw media-playlist content keyed by URL, filled by prefetch
+        self._prefetched: Dict[str, str] = {}
+
     def parse(self) -> bool:
         """
         Fetches and parses the M3U8 playlist content.
@@ -136,17 +318,27 @@ class M3U8Manager:
             bool: True if parsing was successful, False otherwise
         """
         try:
-            content = self.client.request(self.m3u8_url)
-            if not content:
-                logging.error(f"Failed to fetch M3U8 content from {self.m3u8_url}")
-                return False
+            cached = _M3U8_CACHE.get(self.m3u8_url)
+            if cached is not None and (time.monotonic() - cached[0]) < _M3U8_CACHE_TTL:
+                content = cached[1]
+
+            else:
+                content = self.client.request(self.m3u8_url)
+                if not content:
+                    logging.error(f"Failed to fetch M3U8 content from {self.m3u8_url}")
+                    return False
+
+                _M3U8_CACHE[self.m3u8_url] = (time.monotonic(), content)
 
             self.parser.parse_data(uri=self.m3u8_url, raw_content=content)
             self.url_fixer.set_playlist(self.m3u8_url)
             self.is_master = self.parser.is_master_playlist
             return True
-            
+
         except Exception as e:
+
+            # A playlist that fails to parse must not be served from cache again
+            _M3U8_CACHE.pop(self.m3u8_url, None)
             logging.error(f"Error parsing M3U8 from {self.m3u8_url}: {str(e)}")
             return False
 
@@ -162,14 +354,13 @@ class M3U8Manager:
             self.sub_streams = []
 
         else:
-            # Video selection logic
-            if str(FILTER_CUSTOM_RESOLUTION) == "best":
+            # Video selection logic, dispatched on the precomputed mode
+            if _FCR_MODE == "best":
                 self.video_url, self.video_res = self.parser._video.get_best_uri()
-            elif str(FILTER_CUSTOM_RESOLUTION) == "worst":
+            elif _FCR_MODE == "worst":
                 self.video_url, self.video_res = self.parser._video.get_worst_uri()
-            elif str(FILTER_CUSTOM_RESOLUTION).replace("p", "").replace("px", "").isdigit():
-                resolution_value = int(str(FILTER_CUSTOM_RESOLUTION).replace("p", "").replace("px", ""))
-                self.video_url, self.video_res = self.parser._video.get_custom_uri(resolution_value)
+            elif _FCR_MODE == "custom":
+                self.video_url, self.video_res = self.parser._video.get_custom_uri(_FCR_VALUE)
 
                 # Fallback to best if custom resolution not found
                 if self.video_url is None:
@@ -178,87 +369,101 @@ class M3U8Manager:
                 logging.error("Resolution not recognized.")
                 self.video_url, self.video_res = self.parser._video.get_best_uri()
 
-            # Audio selection with auto-select fallback
-            all_audio = self.parser._audio.get_all_uris_and_names() or []
-            
+            # Audio selection with auto-select fallback; the parser lists are
+            # fetched once here and kept for log_selection
+            self.all_audio = self.parser._audio.get_all_uris_and_names() or []
+            self.all_sub = self.parser._subtitle.get_all_uris_and_names() or []
+
             # Try to match with configured languages
             self.audio_streams = [
-                s for s in all_audio
+                s for s in self.all_audio
                 if s.get('language') in DOWNLOAD_SPECIFIC_AUDIO
             ]
-            
+
             # Auto-select first audio if:
             # 1. No audio matched the filters
             # 2. At least one audio track is available
             # 3. Filters are configured (not empty)
-            if not self.audio_streams and all_audio and DOWNLOAD_SPECIFIC_AUDIO:
-                first_audio_lang = all_audio[0].get('language', 'unknown')
+            if not self.audio_streams and self.all_audio and DOWNLOAD_SPECIFIC_AUDIO:
+                first_audio_lang = self.all_audio[0].get('language', 'unknown')
                 console.print(f"\n[yellow]Auto-selecting first available audio track: {first_audio_lang}[/yellow]")
-                self.audio_streams = [all_audio[0]]
+                self.audio_streams = [self.all_audio[0]]
 
             # Subtitle selection
-            self.sub_streams = []
             if "*" in DOWNLOAD_SPECIFIC_SUBTITLE:
-                self.sub_streams = self.parser._subtitle.get_all_uris_and_names() or []
+                self.sub_streams = self.all_sub
             else:
                 self.sub_streams = [
-                    s for s in (self.parser._subtitle.get_all_uris_and_names() or [])
+                    s for s in self.all_sub
                     if s.get('language') in DOWNLOAD_SPECIFIC_SUBTITLE
                 ]
 
+    def prefetch_media_playlists(self):
+        """
+        Fetches every selected audio and subtitle media playlist concurrently,
+        collapsing N serial first-request round trips into one batch. The raw
+        content is stashed so the download phase can skip the refetch.
+        """
+        urls = [self.url_fixer.generate_full_url(a['uri']) for a in self.audio_streams]
+        urls += [s['uri'] for s in self.sub_streams]
+        if not urls:
+            return
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            for url, content in zip(urls, executor.map(self.client.request, urls)):
+                if content:
+                    self._prefetched[url] = content
+
     def log_selection(self):
         """Log the stream selection information in a formatted table."""
-        def calculate_column_widths():
-            data_rows = []
-            
-            # Video information
-            tuple_available_resolution = self.parser._video.get_list_resolution() or []
-            list_available_resolution = [f"{r[0]}x{r[1]}" for r in tuple_available_resolution]
-            available_video = ', '.join(list_available_resolution) if list_available_resolution else "Nothing"
-            
-            downloadable_video = "Nothing"
-            if isinstance(self.video_res, tuple) and len(self.video_res) >= 2:
-                downloadable_video = f"{self.video_res[0]}x{self.video_res[1]}"
-            elif self.video_res and self.video_res != "undefined":
-                downloadable_video = str(self.video_res)
-            
-            data_rows.append(["Video", available_video, str(FILTER_CUSTOM_RESOLUTION), downloadable_video])
-            
-            # Subtitle information
-            available_subtitles = self.parser._subtitle.get_all_uris_and_names() or []
-            if available_subtitles:
-                available_sub_languages = [sub.get('language') for sub in available_subtitles]
-                available_subs = ', '.join(available_sub_languages)
-                downloadable_sub_languages = [sub.get('language') for sub in self.sub_streams]
-                downloadable_subs = ', '.join(downloadable_sub_languages) if downloadable_sub_languages else "Nothing"
-                
-                data_rows.append(["Subtitle", available_subs, ', '.join(DOWNLOAD_SPECIFIC_SUBTITLE), downloadable_subs])
-
-            # Audio information
-            available_audio = self.parser._audio.get_all_uris_and_names() or []
-            if available_audio:
-                available_audio_languages = [audio.get('language') for audio in available_audio]
-                available_audios = ', '.join(available_audio_languages)
-                downloadable_audio_languages = [audio.get('language') for audio in self.audio_streams]
-                downloadable_audios = ', '.join(downloadable_audio_languages) if downloadable_audio_languages else "Nothing"
-                
-                data_rows.append(["Audio", available_audios, ', '.join(DOWNLOAD_SPECIFIC_AUDIO), downloadable_audios])
-            
-            # Calculate max width for each column
-            headers = ["Type", "Available", "Set", "Downloadable"]
-            max_widths = [len(header) for header in headers]
-            
-            for row in data_rows:
-                for i, cell in enumerate(row):
-                    max_widths[i] = max(max_widths[i], len(str(cell)))
-            
-            # Add some padding
-            max_widths = [w + 2 for w in max_widths]
-            
-            return data_rows, max_widths
-        
-        data_rows, column_widths = calculate_column_widths()
-        
+        # Headless runs (CI, piped output) get no value from the table, so
+        # skip building and rendering it entirely
+        if not console.is_terminal:
+            return
+
+        data_rows = []
+
+        # Video information
+        tuple_available_resolution = self.parser._video.get_list_resolution() or []
+        available_video = ', '.join(f"{r[0]}x{r[1]}" for r in tuple_available_resolution) or "Nothing"
+
+        downloadable_video = "Nothing"
+        if isinstance(self.video_res, tuple) and len(self.video_res) >= 2:
+            downloadable_video = f"{self.video_res[0]}x{self.video_res[1]}"
+        elif self.video_res and self.video_res != "undefined":
+            downloadable_video = str(self.video_res)
+
+        data_rows.append(["Video", available_video, str(FILTER_CUSTOM_RESOLUTION), downloadable_video])
+
+        # Subtitle information: reuses the list fetched in select_streams
+        available_subtitles = self.all_sub
+        if available_subtitles:
+            data_rows.append([
+                "Subtitle",
+                ', '.join(sub.get('language') for sub in available_subtitles),
+                ', '.join(sorted(DOWNLOAD_SPECIFIC_SUBTITLE)),
+                ', '.join(sub.get('language') for sub in self.sub_streams) or "Nothing"
+            ])
+
+        # Audio information
+        available_audio = self.all_audio
+        if available_audio:
+            data_rows.append([
+                "Audio",
+                ', '.join(audio.get('language') for audio in available_audio),
+                ', '.join(sorted(DOWNLOAD_SPECIFIC_AUDIO)),
+                ', '.join(audio.get('language') for audio in self.audio_streams) or "Nothing"
+            ])
+
+        # Max width per column in a single pass over the rows, plus padding
+        headers = ["Type", "Available", "Set", "Downloadable"]
+        column_widths = [
+            max(len(header), *(len(str(row[i])) for row in data_rows)) + 2
+            for i, header in enumerate(headers)
+        ]
+
+        from rich.table import Table
+
         table = Table(show_header=True, header_style="bold cyan", border_style="blue")
         table.add_column("Type", style="cyan bold", width=column_widths[0])
         table.add_column("Available", style="green", width=column_widths[1])
@@ -274,25 +479,36 @@ class M3U8Manager:
 
 class DownloadManager:
     """Manages downloading of video, audio, and subtitle streams."""
-    def __init__(self, temp_dir: str, client: HLSClient, url_fixer: M3U8_UrlFix, custom_headers: Optional[Dict[str, str]] = None):
+    def __init__(self, temp_dir: str, client: HLSClient, url_fixer: M3U8_UrlFix, custom_headers: Optional[Dict[str, str]] = None, path_manager: Optional[PathManager] = None, prefetched: Optional[Dict[str, str]] = None):
         """
         Args:
             temp_dir: Directory for storing temporary files
             client: HLSClient instance for making requests
             url_fixer: URL fixer instance for generating complete URLs
             custom_headers: Optional custom headers to use for all requests
+            path_manager: Optional PathManager whose cached scan replaces per-file stats
+            prefetched: Optional media-playlist content already fetched, keyed by URL
         """
         self.temp_dir = temp_dir
         self.client = client
         self.url_fixer = url_fixer
         self.custom_headers = custom_headers
-        self.missing_segments = []
+        self.path_manager = path_manager
+        self.prefetched = prefetched or {}
+        self._fallback_files: Optional[set] = None
+
+        # (nFailed, type) per completed track: all the summary ever reads
+        self.missing_segments: List[tuple] = []
         self.stopped = False
         self.video_segments_count = 0
 
-        # For progress tracking
-        self.current_downloader: Optional[M3U8_Segments] = None
-        self.current_download_type: Optional[str] = None
+        # Guards missing_segments/stopped when tracks download concurrently
+        self._state_lock = threading.Lock()
+
+        # Active segment downloaders keyed by download type, guarded by
+        # _state_lock so progress polls see consistent state while several
+        # tracks run in parallel
+        self.current_downloaders: Dict[str, M3U8_Segments] = {}
 
     def download_video(self, video_url: str) -> bool:
         """
@@ -312,29 +528,28 @@ class DownloadManager:
                 custom_headers=self.custom_headers
             )
 
-            # Set current downloader for progress tracking
-            self.current_downloader = downloader
-            self.current_download_type = 'video'
-            
+            # Register downloader for progress tracking
+            with self._state_lock:
+                self.current_downloaders['video'] = downloader
+
             # Download video and get segment count
             result = downloader.download_streams("Video", "video")
             self.video_segments_count = downloader.get_segments_count()
-            self.missing_segments.append(result)
-
-            # Reset current downloader after completion
-            self.current_downloader = None
-            self.current_download_type = None
+            with self._state_lock:
+                self.missing_segments.append((int(result.get('nFailed', 0)), result.get('type', '')))
+                self.current_downloaders.pop('video', None)
 
             if result.get('stopped', False):
-                self.stopped = True
+                with self._state_lock:
+                    self.stopped = True
                 return False
 
             return True
-        
+
         except Exception as e:
             logging.error(f"Error downloading video from {video_url}: {str(e)}")
-            self.current_downloader = None
-            self.current_download_type = None
+            with self._state_lock:
+                self.current_downloaders.pop('video', None)
             return False
 
     def download_audio(self, audio: Dict) -> bool:
@@ -348,37 +563,44 @@ class DownloadManager:
         try:
             audio_full_url = self.url_fixer.generate_full_url(audio['uri'])
             audio_tmp_dir = os.path.join(self.temp_dir, 'audio', audio['language'])
-            
+
+            # Reuse the prefetched playlist when available: the downloader
+            # then skips its own fetch of the same content
+            prefetched_content = self.prefetched.get(audio_full_url)
+
             # Create downloader with segment limit for audio
             downloader = M3U8_Segments(
-                url=audio_full_url, 
+                url=audio_full_url,
                 tmp_folder=audio_tmp_dir,
+                is_index_url=prefetched_content is None,
                 limit_segments=self.video_segments_count if self.video_segments_count > 0 else None,
                 custom_headers=self.custom_headers
             )
+            if prefetched_content is not None:
+                downloader.parse_data(prefetched_content)
 
-            # Set current downloader for progress tracking
-            self.current_downloader = downloader
-            self.current_download_type = f"audio_{audio['language']}"
+            # Register downloader for progress tracking
+            download_type = f"audio_{audio['language']}"
+            with self._state_lock:
+                self.current_downloaders[download_type] = downloader
 
             # Download audio
             result = downloader.download_streams(f"Audio {audio['language']}", "audio")
-            self.missing_segments.append(result)
-
-            # Reset current downloader after completion
-            self.current_downloader = None
-            self.current_download_type = None
+            with self._state_lock:
+                self.missing_segments.append((int(result.get('nFailed', 0)), result.get('type', '')))
+                self.current_downloaders.pop(download_type, None)
 
             if result.get('stopped', False):
-                self.stopped = True
+                with self._state_lock:
+                    self.stopped = True
                 return False
-                
+
             return True
-        
+
         except Exception as e:
             logging.error(f"Error downloading audio {audio.get('language', 'unknown')}: {str(e)}")
-            self.current_downloader = None
-            self.current_download_type = None
+            with self._state_lock:
+                self.current_downloaders.pop(f"audio_{audio.get('language', 'unknown')}", None)
             return False
 
     def download_subtitle(self, sub: Dict) -> bool:
@@ -389,20 +611,20 @@ class DownloadManager:
             bool: True if download was successful, False otherwise
         """
         try:
-            raw_content = self.client.request(sub['uri'])
+            raw_content = self.prefetched.get(sub['uri']) or self.client.request(sub['uri'])
             if raw_content:
                 sub_path = os.path.join(self.temp_dir, 'subs', f"{sub['language']}.vtt")
 
-                subtitle_parser = M3U8_Parser()
-                subtitle_parser.parse_data(sub['uri'], raw_content)
+                # Extract the VTT URI directly: a full playlist parse per
+                # language only to read its last segment URL is wasted work
+                vtt_lines = _VTT_LINE_RE.findall(raw_content)
+                if not vtt_lines:
+                    return False
+                vtt_url = urljoin(sub['uri'], vtt_lines[-1])
+
+                # Stream the VTT straight to disk instead of buffering it whole
+                return self.client.download_to_file(vtt_url, sub_path)
 
-                with open(sub_path, 'wb') as f:
-                    vtt_url = subtitle_parser.subtitle[-1]
-                    vtt_content = self.client.request(vtt_url, True)
-                    if vtt_content:
-                        f.write(vtt_content)
-                        return True
-                    
             return False
         
         except Exception as e:
@@ -421,50 +643,106 @@ class DownloadManager:
         video_file = os.path.join(self.temp_dir, 'video', '0.ts')
 
         # Download video (this is critical)
-        if not os.path.exists(video_file):
+        if not self._file_exists(video_file):
             if not self.download_video(video_url):
                 logging.error("Critical failure: Video download failed")
                 critical_failure = True
+            else:
+                self._mark_file(video_file)
 
-        # Download audio streams (continue even if some fail)
-        for audio in audio_streams:
-            if self.stopped:
-                break
+        # Audio and subtitle tracks are independent streams: dispatch the
+        # missing ones on a bounded pool instead of downloading them serially
+        # (continue even if some fail)
+        pending = []
 
+        for audio in audio_streams:
             audio_file = os.path.join(self.temp_dir, 'audio', audio['language'], '0.ts')
-            if not os.path.exists(audio_file):
-                success = self.download_audio(audio)
-                if not success:
-                    logging.warning(f"Audio download failed for language {audio.get('language', 'unknown')}, continuing...")
+            if not self._file_exists(audio_file):
+                pending.append(('Audio', audio, self.download_audio, audio_file))
 
-        # Download subtitle streams (continue even if some fail)
         for sub in sub_streams:
-            if self.stopped:
-                break
-
             sub_file = os.path.join(self.temp_dir, 'subs', f"{sub['language']}.vtt")
-            if not os.path.exists(sub_file):
-                success = self.download_subtitle(sub)
-                if not success:
-                    logging.warning(f"Subtitle download failed for language {sub.get('language', 'unknown')}, continuing...")
+            if not self._file_exists(sub_file):
+                pending.append(('Subtitle', sub, self.download_subtitle, sub_file))
+
+        if pending and not self.stopped:
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                futures = {pool.submit(task, stream): (kind, stream, out_file) for kind, stream, task, out_file in pending}
+
+                try:
+                    for future in as_completed(futures):
+                        kind, stream, out_file = futures[future]
+                        if future.result():
+                            self._mark_file(out_file)
+                        else:
+                            logging.warning(f"{kind} download failed for language {stream.get('language', 'unknown')}, continuing...")
+
+                except KeyboardInterrupt:
+                    # SIGINT is delivered to the main thread only: flag every
+                    # active segment downloader so the workers bail out at the
+                    # next segment instead of running their tracks to the end,
+                    # then let the pool drain the (now short) remainder
+                    with self._state_lock:
+                        self.stopped = True
+                        for downloader in self.current_downloaders.values():
+                            downloader.download_interrupted = True
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
 
         return critical_failure or self.stopped
 
+    def get_active_downloaders(self) -> Dict[str, M3U8_Segments]:
+        """Snapshot of the active segment downloaders, keyed by download type."""
+        with self._state_lock:
+            return dict(self.current_downloaders)
+
+    def _file_exists(self, path: str) -> bool:
+        if self.path_manager is not None:
+            return self.path_manager.has_file(path)
+
+        # No PathManager: still amortize to one scan instead of a stat per file
+        if self._fallback_files is None:
+            self._fallback_files = _scan_temp_tree(self.temp_dir)
+        return path in self._fallback_files
+
+    def _mark_file(self, path: str):
+        if self.path_manager is not None:
+            self.path_manager.mark_file(path)
+        elif self._fallback_files is not None:
+            self._fallback_files.add(path)
+
 
 class MergeManager:
     """Handles merging of video, audio, and subtitle streams."""
-    def __init__(self, temp_dir: str, parser: M3U8_Parser, audio_streams: List[Dict], sub_streams: List[Dict]):
+    def __init__(self, temp_dir: str, parser: M3U8_Parser, audio_streams: List[Dict], sub_streams: List[Dict], path_manager: Optional[PathManager] = None):
         """
         Args:
             temp_dir: Directory containing temporary files
             parser: M3U8 parser instance with codec information
             audio_streams: List of audio streams to merge
             sub_streams: List of subtitle streams to merge
+            path_manager: Optional PathManager whose cached scan replaces per-file stats
         """
         self.temp_dir = temp_dir
         self.parser = parser
         self.audio_streams = audio_streams
         self.sub_streams = sub_streams
+        self.path_manager = path_manager
+        self._fallback_files: Optional[set] = None
+
+        # Output metadata reported by the merge-phase ffmpeg run, reused by
+        # the summary to skip a stat and an ffprobe spawn
+        self.output_size: Optional[int] = None
+        self.output_duration: Optional[str] = None
+
+    def _file_exists(self, path: str) -> bool:
+        if self.path_manager is not None:
+            return self.path_manager.has_file(path)
+
+        # No PathManager: still amortize to one scan instead of a stat per file
+        if self._fallback_files is None:
+            self._fallback_files = _scan_temp_tree(self.temp_dir)
+        return path in self._fallback_files
 
     def merge(self) -> tuple[str, bool]:
         """
@@ -488,18 +766,55 @@ class MergeManager:
             )
 
         else:
-            if self.audio_streams:
-
-                # Only include audio tracks that actually exist
-                existing_audio_tracks = []
-                for a in self.audio_streams:
-                    audio_path = os.path.join(self.temp_dir, 'audio', a['language'], '0.ts')
-                    if os.path.exists(audio_path):
-                        existing_audio_tracks.append({
-                            'path': audio_path,
-                            'name': a['language']
+            # Only include audio/subtitle tracks that actually exist
+            existing_audio_tracks = []
+            for a in self.audio_streams:
+                audio_path = os.path.join(self.temp_dir, 'audio', a['language'], '0.ts')
+                if self._file_exists(audio_path):
+                    existing_audio_tracks.append({
+                        'path': audio_path,
+                        'name': a['language']
+                    })
+
+            existing_sub_tracks = []
+            if MERGE_SUBTITLE:
+                for s in self.sub_streams:
+                    sub_path = os.path.join(self.temp_dir, 'subs', f"{s['language']}.vtt")
+                    if self._file_exists(sub_path):
+                        existing_sub_tracks.append({
+                            'path': sub_path,
+                            'language': s['language']
                         })
 
+            if existing_audio_tracks and existing_sub_tracks:
+
+                # Audio and subtitles present: mux everything in one ffmpeg
+                # pass instead of writing an intermediate audio-merged file
+                final_path = os.path.join(self.temp_dir, f'final.{EXTENSION_OUTPUT}')
+                merged_file, use_shortest = join_av_and_subs(
+                    video_path=video_file,
+                    audio_tracks=existing_audio_tracks,
+                    subtitles_list=existing_sub_tracks,
+                    out_path=final_path
+                )
+
+                # Fall back to the two-step chain if the fused pass failed
+                if not os.path.exists(merged_file):
+                    merged_audio_path = os.path.join(self.temp_dir, f'merged_audio.{EXTENSION_OUTPUT}')
+                    merged_file, use_shortest = join_audios(
+                        video_path=video_file,
+                        audio_tracks=existing_audio_tracks,
+                        out_path=merged_audio_path,
+                        codec=self.parser.codec,
+                        is_final=False
+                    )
+                    merged_file = join_subtitle(
+                        video_path=merged_file,
+                        subtitles_list=existing_sub_tracks,
+                        out_path=final_path
+                    )
+
+            else:
                 if existing_audio_tracks:
                     merged_audio_path = os.path.join(self.temp_dir, f'merged_audio.{EXTENSION_OUTPUT}')
                     merged_file, use_shortest = join_audios(
@@ -509,18 +824,6 @@ class MergeManager:
                         codec=self.parser.codec
                     )
 
-            if MERGE_SUBTITLE and self.sub_streams:
-
-                # Only include subtitle tracks that actually exist
-                existing_sub_tracks = []
-                for s in self.sub_streams:
-                    sub_path = os.path.join(self.temp_dir, 'subs', f"{s['language']}.vtt")
-                    if os.path.exists(sub_path):
-                        existing_sub_tracks.append({
-                            'path': sub_path,
-                            'language': s['language']
-                        })
-
                 if existing_sub_tracks:
                     merged_subs_path = os.path.join(self.temp_dir, f'final.{EXTENSION_OUTPUT}')
                     merged_file = join_subtitle(
@@ -529,6 +832,13 @@ class MergeManager:
                         out_path=merged_subs_path
                     )
 
+        # When an ffmpeg pass produced the file, its progress output already
+        # reported size and duration: keep them for the summary
+        if merged_file != video_file:
+            stats = get_last_run_stats()
+            self.output_size = stats.get('size_bytes')
+            self.output_duration = stats.get('time')
+
         return merged_file, use_shortest
 
 
@@ -539,6 +849,7 @@ class HLS_Downloader:
         Initializes the HLS_Downloader with parameters.
         """
         self.m3u8_url = m3u8_url
+        _warm_dns(m3u8_url)
         self.path_manager = PathManager(m3u8_url, output_path)
         self.custom_headers = headers
         self.client = HLSClient(custom_headers=self.custom_headers)
@@ -563,29 +874,14 @@ class HLS_Downloader:
 
         if GET_ONLY_LINK:
             console.print(f"URL: [bold red]{self.m3u8_url}[/bold red]")
-            return {
-                'path': None,
-                'url': self.m3u8_url,
-                'is_master': getattr(self.m3u8_manager, 'is_master', None),
-                'msg': None,
-                'error': None,
-                'stopped': True
-            }
+            return self._result(stopped=True)
 
         console.print("[cyan]You can safely stop the download with [bold]Ctrl+c[bold] [cyan]")
 
         try:
             if os.path.exists(self.path_manager.output_path):
                 console.print(f"[red]Output file {self.path_manager.output_path} already exists![/red]")
-                response = {
-                    'path': self.path_manager.output_path,
-                    'url': self.m3u8_url,
-                    'is_master': False,
-                    'msg': 'File already exists',
-                    'error': None,
-                    'stopped': False
-                }
-                return response
+                return self._result(path=self.path_manager.output_path, msg='File already exists')
 
             self.path_manager.setup_directories()
 
@@ -597,11 +893,21 @@ class HLS_Downloader:
                 logging.info("Detected media playlist (not master)")
                 self.m3u8_manager.log_selection()
 
+            # Pre-create the per-language audio dirs here, on the cold path,
+            # so the download workers never hit mkdir during the hot loop
+            for audio in self.m3u8_manager.audio_streams:
+                os.makedirs(os.path.join(self.path_manager.temp_dir, 'audio', audio['language']), exist_ok=True)
+
+            # Warm all selected media playlists in parallel before downloading
+            self.m3u8_manager.prefetch_media_playlists()
+
             self.download_manager = DownloadManager(
                 temp_dir=self.path_manager.temp_dir,
                 client=self.client,
                 url_fixer=self.m3u8_manager.url_fixer,
-                custom_headers=self.custom_headers
+                custom_headers=self.custom_headers,
+                path_manager=self.path_manager,
+                prefetched=self.m3u8_manager._prefetched
             )
 
             # Check if download had critical failures
@@ -615,20 +921,14 @@ class HLS_Downloader:
                 error_msg = "Critical download failure occurred"
                 console.print(f"[red]Download failed: {error_msg}[/red]")
                 self.path_manager.cleanup()
-                return {
-                    'path': None,
-                    'url': self.m3u8_url,
-                    'is_master': self.m3u8_manager.is_master,
-                    'msg': None,
-                    'error': error_msg,
-                    'stopped': self.download_manager.stopped
-                }
+                return self._result(error=error_msg, stopped=self.download_manager.stopped)
 
             self.merge_manager = MergeManager(
                 temp_dir=self.path_manager.temp_dir,
                 parser=self.m3u8_manager.parser,
                 audio_streams=self.m3u8_manager.audio_streams,
-                sub_streams=self.m3u8_manager.sub_streams
+                sub_streams=self.m3u8_manager.sub_streams,
+                path_manager=self.path_manager
             )
 
             final_file, use_shortest = self.merge_manager.merge()
@@ -636,26 +936,16 @@ class HLS_Downloader:
             self._print_summary(use_shortest)
             self.path_manager.cleanup()
 
-            return {
-                'path': self.path_manager.output_path,
-                'url': self.m3u8_url,
-                'is_master': self.m3u8_manager.is_master,
-                'msg': 'Download completed successfully',
-                'error': None,
-                'stopped': self.download_manager.stopped
-            }
+            return self._result(
+                path=self.path_manager.output_path,
+                msg='Download completed successfully',
+                stopped=self.download_manager.stopped
+            )
 
         except KeyboardInterrupt:
             console.print("\n[yellow]Download interrupted by user[/yellow]")
             self.path_manager.cleanup()
-            return {
-                'path': None,
-                'url': self.m3u8_url,
-                'is_master': getattr(self.m3u8_manager, 'is_master', None),
-                'msg': 'Download interrupted by user',
-                'error': None,
-                'stopped': True
-            }
+            return self._result(msg='Download interrupted by user', stopped=True)
 
         except Exception as e:
             error_msg = str(e)
@@ -664,37 +954,52 @@ class HLS_Downloader:
 
             # Cleanup on error
             self.path_manager.cleanup()
-
-            return {
-                'path': None,
-                'url': self.m3u8_url,
-                'is_master': getattr(self.m3u8_manager, 'is_master', None),
-                'msg': None,
-                'error': error_msg,
-                'stopped': False
-            }
+            return self._result(error=error_msg)
+
+        finally:
+            self.client.close()
+
+    def _result(self, path: Optional[str] = None, msg: Optional[str] = None, error: Optional[str] = None, stopped: bool = False) -> Dict[str, Any]:
+        """Builds the start() response from one compact DownloadResult record."""
+        return DownloadResult(
+            path=path,
+            url=self.m3u8_url,
+            is_master=getattr(self.m3u8_manager, 'is_master', None),
+            msg=msg,
+            error=error,
+            stopped=stopped
+        )._asdict()
 
     def _print_summary(self, use_shortest: bool):
         """Prints download summary including file size, duration, and any missing segments."""
-        missing_ts = False
-        missing_info = ""
+        failed_tracks = [item for item in self.download_manager.missing_segments if item[0] >= 1]
+        missing_ts = bool(failed_tracks)
+        missing_info = ''.join(
+            f"[red]TS Failed: {n_failed} {track_type} tracks[/red]"
+            for n_failed, track_type in failed_tracks
+        )
 
-        for item in self.download_manager.missing_segments:
-            if int(item['nFailed']) >= 1:
-                missing_ts = True
-                missing_info += f"[red]TS Failed: {item['nFailed']} {item['type']} tracks[/red]"
+        # Prefer the size/duration ffmpeg reported while writing the file;
+        # only fall back to a stat + ffprobe when they were not captured
+        size_bytes = self.merge_manager.output_size
+        if size_bytes is None:
+            size_bytes = os.path.getsize(self.path_manager.output_path)
+        file_size = internet_manager.format_file_size(size_bytes)
 
-        file_size = internet_manager.format_file_size(os.path.getsize(self.path_manager.output_path))
-        duration = print_duration_table(self.path_manager.output_path, description=False, return_string=True)
+        duration = _format_ffmpeg_time(self.merge_manager.output_duration)
+        if duration is None:
+            duration = print_duration_table(self.path_manager.output_path, description=False, return_string=True)
 
         # Rename output file if there were missing segments or shortest used
+        # Slice the known extension off the end rather than str.replace, which
+        # also rewrites the extension if it appears earlier in the path
         new_filename = self.path_manager.output_path
         if missing_ts and use_shortest:
-            new_filename = new_filename.replace(EXTENSION_OUTPUT, f"_failed_sync_ts.{EXTENSION_OUTPUT}")
+            new_filename = new_filename[:-_EXT_LEN] + f"_failed_sync_ts.{EXTENSION_OUTPUT}"
         elif missing_ts:
-            new_filename = new_filename.replace(EXTENSION_OUTPUT, f"_failed_ts.{EXTENSION_OUTPUT}")
+            new_filename = new_filename[:-_EXT_LEN] + f"_failed_ts.{EXTENSION_OUTPUT}"
         elif use_shortest:
-            new_filename = new_filename.replace(EXTENSION_OUTPUT, f"_failed_sync.{EXTENSION_OUTPUT}")
+            new_filename = new_filename[:-_EXT_LEN] + f"_failed_sync.{EXTENSION_OUTPUT}"
 
         # Rename the file accordingly
         if missing_ts or use_shortest:
@@ -704,16 +1009,20 @@ class HLS_Downloader:
         console.print(f"[yellow]Output [red]{os.path.abspath(self.path_manager.output_path)} [cyan]with size [red]{file_size} [cyan]and duration [red]{duration}")
 
     def get_progress_data(self) -> Optional[Dict]:
-        """Get current download progress data."""
-        if not self.download_manager.current_downloader:
+        """Get current progress for every active stream, keyed by download type."""
+        active = self.download_manager.get_active_downloaders()
+        if not active:
             return None
 
-        try:
-            progress = self.download_manager.current_downloader.get_progress_data()
-            if progress:
-                progress['download_type'] = self.download_manager.current_download_type
-            return progress
-            
-        except Exception as e:
-            logging.error(f"Error getting progress data: {e}")
-            return None
\ No newline at end of file
+        progress_by_type = {}
+        for download_type, downloader in active.items():
+            try:
+                progress = downloader.get_progress_data()
+                if progress:
+                    progress['download_type'] = download_type
+                    progress_by_type[download_type] = progress
+
+            except Exception as e:
+                logging.error(f"Error getting progress data for {download_type}: {e}")
+
+        return progress_by_type or None
\ No newline at end of file
@@ -1,6 +1,7 @@
 # 18.04.24
 
-from .command import join_video, join_audios, join_subtitle
+from .command import join_video, join_audios, join_subtitle, join_av_and_subs, join_videos_batch
+from .capture import get_last_run_stats
 from .util import print_duration_table, get_video_duration
 
 
@@ -8,6 +9,9 @@ __all__ = [
     "join_video",
     "join_audios",
     "join_subtitle",
+    "join_av_and_subs",
+    "join_videos_batch",
+    "get_last_run_stats",
     "print_duration_table",
     "get_video_duration",
 ]
\ No newline at end of file
@@ -1,5 +1,6 @@
 # 16.04.24
 
+import os
 import re
 import time
 import logging
@@ -19,6 +20,15 @@ from StreamingCommunity.Util.os import internet_manager
 console = Console()
 terminate_flag = threading.Event()
 
+# Stats parsed from the most recent capture: callers can reuse them instead
+# of re-probing the file ffmpeg just wrote
+_last_run_stats: dict = {}
+
+
+def get_last_run_stats() -> dict:
+    """Returns 'size_bytes' and 'time' parsed from the last ffmpeg run, if any."""
+    return dict(_last_run_stats)
+
 
 def capture_output(process: subprocess.Popen, description: str) -> None:
     """
@@ -32,59 +42,81 @@ def capture_output(process: subprocess.Popen, description: str) -> None:
         max_length = 0
         start_time = time.time()
 
-        for line in iter(process.stdout.readline, ''):          
-            try:
-                line = line.strip()
-                logging.info(f"CAPTURE ffmpeg line: {line}")
-
-                if not line:
-                    continue
-
-                # Check if termination is requested
-                if terminate_flag.is_set():
-                    break
-
-                if "size=" in line:
-                    try:
-                        elapsed_time = time.time() - start_time
-                        data = parse_output_line(line)
-
-                        if 'q' in data:
-                            is_end = (float(data.get('q', -1.0)) == -1.0)
-                            size_key = 'Lsize' if is_end else 'size'
-                            byte_size = int(re.findall(r'\d+', data.get(size_key, '0'))[0]) * 1000
-                        else:
-                            byte_size = int(re.findall(r'\d+', data.get('size', '0'))[0]) * 1000
-
-                        # Extract additional information
-                        fps = data.get('fps', 'N/A')
-                        time_processed = data.get('time', 'N/A')
-                        bitrate = data.get('bitrate', 'N/A')
-                        speed = data.get('speed', 'N/A')
-
-                        # Format elapsed time as HH:MM:SS
-                        elapsed_formatted = format_time(elapsed_time)
-
-                        # Construct the progress string with formatted output information
-                        progress_string = (
-                            f"{description}[white]: "
-                            f"([green]'fps': [yellow]{fps}[white], "
-                            f"[green]'speed': [yellow]{speed}[white], "
-                            f"[green]'size': [yellow]{internet_manager.format_file_size(byte_size)}[white], "
-                            f"[green]'time': [yellow]{time_processed}[white], "
-                            f"[green]'bitrate': [yellow]{bitrate}[white], "
-                            f"[green]'elapsed': [yellow]{elapsed_formatted}[white])"
-                        )
-                        max_length = max(max_length, len(progress_string))
-
-                        # Print the progress string to the console, overwriting the previous line
-                        console.print(progress_string.ljust(max_length), end="\r")
-
-                    except Exception as e:
-                        logging.error(f"Error parsing output line: {line} - {e}")
-
-            except Exception as e:
-                logging.error(f"Error processing line from subprocess: {e}")
+        # Drain the pipe with os.read in large chunks instead of one blocking
+        # text-mode readline per progress line: ffmpeg emits \r-terminated
+        # status spam, and chunked reads mean far fewer Python-level wakeups
+        fd = process.stdout.fileno()
+        pending = b''
+        stop = False
+
+        while not stop:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+
+            pending += chunk
+            lines = pending.replace(b'\r', b'\n').split(b'\n')
+            pending = lines.pop()
+
+            for raw_line in lines:
+                try:
+                    line = raw_line.decode('utf-8', errors='replace').strip()
+                    logging.info(f"CAPTURE ffmpeg line: {line}")
+
+                    if not line:
+                        continue
+
+                    # Check if termination is requested
+                    if terminate_flag.is_set():
+                        stop = True
+                        break
+
+                    if "size=" in line:
+                        try:
+                            elapsed_time = time.time() - start_time
+                            data = parse_output_line(line)
+
+                            if 'q' in data:
+                                is_end = (float(data.get('q', -1.0)) == -1.0)
+                                size_key = 'Lsize' if is_end else 'size'
+                                byte_size = int(re.findall(r'\d+', data.get(size_key, '0'))[0]) * 1000
+                            else:
+                                byte_size = int(re.findall(r'\d+', data.get('size', '0'))[0]) * 1000
+
+                            # Extract additional information
+                            fps = data.get('fps', 'N/A')
+                            time_processed = data.get('time', 'N/A')
+                            bitrate = data.get('bitrate', 'N/A')
+                            speed = data.get('speed', 'N/A')
+
+                            # Keep the latest parsed values for get_last_run_stats
+                            _last_run_stats['size_bytes'] = byte_size
+                            if time_processed != 'N/A':
+                                _last_run_stats['time'] = time_processed
+
+                            # Format elapsed time as HH:MM:SS
+                            elapsed_formatted = format_time(elapsed_time)
+
+                            # Construct the progress string with formatted output information
+                            progress_string = (
+                                f"{description}[white]: "
+                                f"([green]'fps': [yellow]{fps}[white], "
+                                f"[green]'speed': [yellow]{speed}[white], "
+                                f"[green]'size': [yellow]{internet_manager.format_file_size(byte_size)}[white], "
+                                f"[green]'time': [yellow]{time_processed}[white], "
+                                f"[green]'bitrate': [yellow]{bitrate}[white], "
+                                f"[green]'elapsed': [yellow]{elapsed_formatted}[white])"
+                            )
+                            max_length = max(max_length, len(progress_string))
+
+                            # Print the progress string to the console, overwriting the previous line
+                            console.print(progress_string.ljust(max_length), end="\r")
+
+                        except Exception as e:
+                            logging.error(f"Error parsing output line: {line} - {e}")
+
+                except Exception as e:
+                    logging.error(f"Error processing line from subprocess: {e}")
 
     except Exception as e:
         logging.error(f"Error in capture_output: {e}")
@@ -166,13 +198,15 @@ def capture_ffmpeg_real_time(ffmpeg_command: list, description: str) -> None:
     """
     global terminate_flag
 
-    # Clear the terminate_flag before starting a new capture
+    # Clear the terminate_flag and stale stats before starting a new capture
     terminate_flag.clear()
+    _last_run_stats.clear()
 
     try:
 
-        # Start the ffmpeg process with subprocess.Popen
-        process = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        # Start the ffmpeg process with subprocess.Popen; the pipe stays in
+        # binary mode since capture_output drains the raw fd itself
+        process = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
 
         # Start a thread to capture and print output
         output_thread = threading.Thread(target=capture_output, args=(process, description))
@@ -1,12 +1,17 @@
 # 31.01.24
 
+import os
+import shlex
+import shutil
 import logging
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List, Dict
 
 
 # External library
 from rich.console import Console
+from rich.text import Text
 
 
 # Internal utilities
@@ -15,7 +20,7 @@ from StreamingCommunity.Util.os import get_ffmpeg_path
 
 
 # Logic class
-from .util import need_to_force_to_ts, check_duration_v_a
+from .util import need_to_force_to_ts, get_video_codec_name, probe_codecs, probe_durations
 from .capture import capture_ffmpeg_real_time
 from ..M3U8 import M3U8_Codec
 
@@ -28,57 +33,122 @@ PARAM_VIDEO = config_manager.get_list("M3U8_CONVERSION", "param_video")
 PARAM_AUDIO = config_manager.get_list("M3U8_CONVERSION", "param_audio")
 PARAM_FINAL = config_manager.get_list("M3U8_CONVERSION", "param_final")
 PARAM_SUBTITLES = config_manager.get_list("M3U8_CONVERSION", "param_subtitles")
+MAX_PARALLEL_JOINS = config_manager.get_int("M3U8_CONVERSION", "max_parallel_joins", default=min(os.cpu_count() or 1, 4))
+ALLOW_COPY = config_manager.get_bool("M3U8_CONVERSION", "allow_copy", default=True)
+
+# Codecs mp4 can hold as-is: remuxing them is I/O-bound, re-encoding is not
+_MP4_COPY_CODECS = frozenset({'h264', 'hevc'})
+
+# mkvmerge is a remux-only tool that skips codec init entirely, making it
+# noticeably faster than ffmpeg's muxer for mkv subtitle merges
+MKVMERGE_BIN = shutil.which('mkvmerge')
 
 
 # Variable
 console = Console()
 
+# CPU encoders in the configured params and their NVENC counterparts, so GPU
+# runs encode on the dedicated ASIC instead of x264/x265 on the CPU
+_NVENC_ENCODERS = {'libx264': 'h264_nvenc', 'libx265': 'hevc_nvenc'}
+
+# Codecs with a dedicated NVDEC decoder, keyed by ffprobe codec name
+_CUVID_DECODERS = {
+    'h264': 'h264_cuvid',
+    'hevc': 'hevc_cuvid',
+    'av1': 'av1_cuvid',
+    'vp8': 'vp8_cuvid',
+    'vp9': 'vp9_cuvid',
+    'mpeg2video': 'mpeg2_cuvid'
+}
+
 
-def add_encoding_params(ffmpeg_cmd: List[str]):
+def gpu_input_flags(video_path: str) -> List[str]:
+    """
+    Build the hwaccel flags to place before the video input so decoded frames
+    stay in GPU memory instead of round-tripping over PCIe.
+
+    Parameters:
+        - video_path (str): The path to the video file, probed for its codec.
+    """
+    flags = ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+
+    decoder = _CUVID_DECODERS.get(get_video_codec_name(video_path))
+    if decoder:
+        flags.extend(['-c:v', decoder])
+
+    return flags
+
+
+# Encoding params never change during a run: resolve the PARAM_FINAL
+# fallback and the NVENC swap once at import and keep them as a tuple,
+# which splices into the command list in a single C-level copy
+_ENCODING_PARAMS = tuple(PARAM_FINAL if PARAM_FINAL else PARAM_VIDEO + PARAM_AUDIO)
+if USE_GPU:
+    _ENCODING_PARAMS = tuple(_NVENC_ENCODERS.get(param, param) for param in _ENCODING_PARAMS)
+
+
+def add_encoding_params(ffmpeg_cmd: List[str], out_path: str = None, is_final: bool = True):
     """
     Add encoding parameters to the ffmpeg command.
-    
+
     Parameters:
         ffmpeg_cmd (List[str]): List of the FFmpeg command to modify
+        out_path (str): Output path, used to decide mp4 finalization flags.
+        is_final (bool): False for intermediate files that feed another join.
     """
-    if PARAM_FINAL:
-        ffmpeg_cmd.extend(PARAM_FINAL)
-    else:
-        ffmpeg_cmd.extend(PARAM_VIDEO)
-        ffmpeg_cmd.extend(PARAM_AUDIO)
+    ffmpeg_cmd += _ENCODING_PARAMS
+
+    # faststart's moov relocation is a second pass over the whole output:
+    # only pay for it on the file that will actually be played
+    if is_final and out_path and out_path.endswith('.mp4'):
+        ffmpeg_cmd.extend(['-movflags', '+faststart'])
 
 
-def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
+def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None, is_final: bool = True):
     """
     Joins single ts video file to mp4
-    
+
     Parameters:
         - video_path (str): The path to the video file.
         - out_path (str): The path to save the output file.
         - codec (M3U8_Codec): The video codec to use (non utilizzato con nuova configurazione).
+        - is_final (bool): False when the output feeds another join pass.
     """
-    ffmpeg_cmd = [get_ffmpeg_path()]
-
-    # Enabled the use of gpu
-    if USE_GPU:
-        ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
-
-    # Add mpegts to force to detect input file as ts file
-    if need_to_force_to_ts(video_path):
-        ffmpeg_cmd.extend(['-f', 'mpegts'])
-
-    # Insert input video path
-    ffmpeg_cmd.extend(['-i', video_path])
+    # Build the input half in one literal so the list is sized once:
+    # GPU decode flags, optional mpegts demuxer forcing, then the input
+    ffmpeg_cmd = [
+        get_ffmpeg_path(),
+        *(gpu_input_flags(video_path) if USE_GPU else []),
+        *(['-f', 'mpegts'] if need_to_force_to_ts(video_path) else []),
+        '-i', video_path
+    ]
+
+    # When the source codec already fits the mp4 container, remux with
+    # stream copy: I/O-bound instead of a full re-encode
+    vcodec, acodec = probe_codecs(video_path) if ALLOW_COPY else (None, None)
+    if vcodec in _MP4_COPY_CODECS and out_path.endswith('.mp4'):
+        ffmpeg_cmd.extend(['-c:v', 'copy', '-c:a', 'copy'])
+        # The ADTS-to-ASC repack only applies to AAC audio; on AC-3/MP3
+        # tracks ffmpeg refuses the filter and the whole remux fails
+        if acodec == 'aac':
+            ffmpeg_cmd.extend(['-bsf:a', 'aac_adtstoasc'])
+        if is_final:
+            ffmpeg_cmd.extend(['-movflags', '+faststart'])
+    else:
+        # Add encoding parameters (prima dell'output)
+        add_encoding_params(ffmpeg_cmd, out_path, is_final)
 
-    # Add encoding parameters (prima dell'output)
-    add_encoding_params(ffmpeg_cmd)
+    # Let ffmpeg size its own decode/encode thread pools
+    ffmpeg_cmd.extend(['-threads', '0'])
 
     # Output file and overwrite
     ffmpeg_cmd.extend([out_path, '-y'])
 
     # Run join
     if DEBUG_MODE:
-        subprocess.run(ffmpeg_cmd, check=True)
+        # close_fds=False keeps CPython on the posix_spawn fast path, avoiding
+        # a fork-COW of the whole interpreter heap per join
+        subprocess.run(ffmpeg_cmd, check=True, close_fds=False)
     else:
         capture_ffmpeg_real_time(ffmpeg_cmd, "[yellow]FFMPEG [cyan]Join video")
         print()
@@ -86,10 +156,10 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
     return out_path
 
 
-def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: str, codec: M3U8_Codec = None, limit_duration_diff: float = 2.0):
+def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: str, codec: M3U8_Codec = None, limit_duration_diff: float = 2.0, is_final: bool = True):
     """
     Joins audio tracks with a video file using FFmpeg.
-    
+
     Parameters:
         - video_path (str): The path to the video file.
         - audio_tracks (list[dict[str, str]]): A list of dictionaries containing information about audio tracks.
@@ -97,15 +167,20 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
         - out_path (str): The path to save the output file.
         - codec (M3U8_Codec): The video codec to use (non utilizzato con nuova configurazione).
         - limit_duration_diff (float): Maximum duration difference in seconds.
+        - is_final (bool): False when the output feeds another join pass.
     """
     use_shortest = False
     duration_diffs = []
-    
+
+    # One parallel probe batch instead of re-probing the video per track
+    durations = probe_durations([video_path] + [t.get('path') for t in audio_tracks])
+    video_duration = durations.get(video_path) or 0.0
+
     for audio_track in audio_tracks:
-        audio_path = audio_track.get('path')
         audio_lang = audio_track.get('name', 'unknown')
-        is_matched, diff, video_duration, audio_duration = check_duration_v_a(video_path, audio_path)
-        
+        audio_duration = durations.get(audio_track.get('path')) or 0.0
+        diff = abs(video_duration - audio_duration)
+
         duration_diffs.append({
             'language': audio_lang,
             'difference': diff,
@@ -113,39 +188,105 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
             'video_duration': video_duration,
             'audio_duration': audio_duration
         })
-        
+
         # If any audio track has a significant duration difference, use -shortest
         if diff > limit_duration_diff:
             use_shortest = True
 
-    # Print duration differences for each track
+    # Print duration differences for each track in one styled write,
+    # instead of running the markup parser and a console flush per track
     if use_shortest:
+        report = Text()
         for track in duration_diffs:
-            color = "red" if track['has_error'] else "green"
-            console.print(f"[{color}]Audio {track['language']}: Video duration: {track['video_duration']:.2f}s, Audio duration: {track['audio_duration']:.2f}s, Difference: {track['difference']:.2f}s[/{color}]")
+            report.append(
+                f"Audio {track['language']}: Video duration: {track['video_duration']:.2f}s, Audio duration: {track['audio_duration']:.2f}s, Difference: {track['difference']:.2f}s\n",
+                style="red" if track['has_error'] else "green"
+            )
+        console.print(report, end="")
+
+    # Build inputs and maps in one literal so the list is sized once
+    ffmpeg_cmd = [
+        get_ffmpeg_path(),
+        *(gpu_input_flags(video_path) if USE_GPU else []),
+        '-i', video_path,
+        *[arg for track in audio_tracks for arg in ('-i', track.get('path'))],
+        '-map', '0:v',
+        *[arg for i in range(1, len(audio_tracks) + 1) for arg in ('-map', f'{i}:a')]
+    ]
 
-    # Start command with locate ffmpeg
-    ffmpeg_cmd = [get_ffmpeg_path()]
+    # Add encoding parameters (prima di -shortest e output)
+    add_encoding_params(ffmpeg_cmd, out_path, is_final)
 
-    # Enabled the use of gpu
-    if USE_GPU:
-        ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
+    # Use shortest input path if any audio track has significant difference
+    if use_shortest:
+        ffmpeg_cmd.extend(['-shortest', '-strict', 'experimental'])
 
-    # Insert input video path
-    ffmpeg_cmd.extend(['-i', video_path])
+    # Output file and overwrite
+    ffmpeg_cmd.extend([out_path, '-y'])
+
+    # Run join
+    if DEBUG_MODE:
+        # close_fds=False keeps CPython on the posix_spawn fast path, avoiding
+        # a fork-COW of the whole interpreter heap per join
+        subprocess.run(ffmpeg_cmd, check=True, close_fds=False)
+    else:
+        capture_ffmpeg_real_time(ffmpeg_cmd, "[yellow]FFMPEG [cyan]Join audio")
+        print()
+
+    return out_path, use_shortest
 
-    # Add audio tracks as input
-    for i, audio_track in enumerate(audio_tracks):
-        ffmpeg_cmd.extend(['-i', audio_track.get('path')])
 
-    # Map the video and audio streams
-    ffmpeg_cmd.extend(['-map', '0:v'])
-    
-    for i in range(1, len(audio_tracks) + 1):
-        ffmpeg_cmd.extend(['-map', f'{i}:a'])
+def join_av_and_subs(video_path: str, audio_tracks: List[Dict[str, str]], subtitles_list: List[Dict[str, str]], out_path: str, limit_duration_diff: float = 2.0):
+    """
+    Joins video, audio tracks and subtitles in a single FFmpeg pass.
+
+    Parameters:
+        - video_path (str): The path to the video file.
+        - audio_tracks (list[dict[str, str]]): A list of dictionaries containing information about audio tracks.
+            Each dictionary should contain the 'path' and 'name' keys.
+        - subtitles_list (list[dict[str, str]]): A list of dictionaries containing information about subtitles.
+            Each dictionary should contain the 'path' key with the path to the subtitle file and the 'language' key.
+        - out_path (str): The path to save the output file.
+        - limit_duration_diff (float): Maximum duration difference in seconds.
+    """
+    use_shortest = False
+
+    # One parallel probe batch instead of re-probing the video per track
+    durations = probe_durations([video_path] + [t.get('path') for t in audio_tracks])
+    video_duration = durations.get(video_path) or 0.0
+
+    for audio_track in audio_tracks:
+        audio_duration = durations.get(audio_track.get('path')) or 0.0
+        diff = abs(video_duration - audio_duration)
+
+        # If any audio track has a significant duration difference, use -shortest
+        if diff > limit_duration_diff:
+            use_shortest = True
+            audio_lang = audio_track.get('name', 'unknown')
+            console.print(f"[red]Audio {audio_lang}: Video duration: {video_duration:.2f}s, Audio duration: {audio_duration:.2f}s, Difference: {diff:.2f}s[/red]")
+
+    # Build inputs, maps and per-track metadata in one literal so the
+    # list is sized once instead of reallocating across a dozen extends
+    n_audio = len(audio_tracks)
+    ffmpeg_cmd = [
+        get_ffmpeg_path(),
+        *(gpu_input_flags(video_path) if USE_GPU else []),
+        '-i', video_path,
+        *[arg for track in audio_tracks for arg in ('-i', track.get('path'))],
+        *[arg for subtitle in subtitles_list for arg in ('-i', subtitle['path'])],
+        '-map', '0:v',
+        *[arg for i, track in enumerate(audio_tracks) for arg in
+          ('-map', f'{i + 1}:a', f'-metadata:s:a:{i}', f"language={track.get('name', 'unknown')}")],
+        *[arg for idx, subtitle in enumerate(subtitles_list) for arg in
+          ('-map', f'{idx + n_audio + 1}:s', f'-metadata:s:s:{idx}', f"title={subtitle['language']}")]
+    ]
 
     # Add encoding parameters (prima di -shortest e output)
-    add_encoding_params(ffmpeg_cmd)
+    add_encoding_params(ffmpeg_cmd, out_path)
+
+    # Add subtitle encoding parameters from config
+    if PARAM_SUBTITLES:
+        ffmpeg_cmd.extend(PARAM_SUBTITLES)
 
     # Use shortest input path if any audio track has significant difference
     if use_shortest:
@@ -156,14 +297,66 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
 
     # Run join
     if DEBUG_MODE:
-        subprocess.run(ffmpeg_cmd, check=True)
+        # close_fds=False keeps CPython on the posix_spawn fast path, avoiding
+        # a fork-COW of the whole interpreter heap per join
+        subprocess.run(ffmpeg_cmd, check=True, close_fds=False)
     else:
-        capture_ffmpeg_real_time(ffmpeg_cmd, "[yellow]FFMPEG [cyan]Join audio")
+        capture_ffmpeg_real_time(ffmpeg_cmd, "[yellow]FFMPEG [cyan]Join av+subs")
         print()
 
     return out_path, use_shortest
 
 
+def _lower_priority():
+    """Nices down join workers so batch conversions don't starve the UI."""
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+
+def _run_join_job(job: Dict):
+    """Executes one join job in a worker process."""
+    join_func = _JOIN_FUNCS[job['type']]
+    kwargs = {key: value for key, value in job.items() if key != 'type'}
+    return join_func(**kwargs)
+
+
+def join_videos_batch(jobs: List[Dict]):
+    """
+    Runs several join jobs concurrently, one ffmpeg process per file.
+
+    Parameters:
+        - jobs (list[dict]): Each entry holds 'type' ('video', 'audios', 'subtitle'
+            or 'av_and_subs') plus the keyword arguments of the matching join_* function.
+
+    Returns:
+        list: The result of each join function, in input order (None on failure).
+    """
+    if not jobs:
+        return []
+
+    max_workers = min(MAX_PARALLEL_JOINS, len(jobs))
+
+    # Consumer NVIDIA cards cap concurrent NVENC sessions at two
+    if USE_GPU:
+        max_workers = min(max_workers, 2)
+
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_lower_priority) as pool:
+        futures = {pool.submit(_run_join_job, job): idx for idx, job in enumerate(jobs)}
+
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                logging.error(f"Join job {idx} failed: {e}")
+
+    return results
+
+
 def join_subtitle(video_path: str, subtitles_list: List[Dict[str, str]], out_path: str):
     """
     Joins subtitles with a video file using FFmpeg.
@@ -174,36 +367,63 @@ def join_subtitle(video_path: str, subtitles_list: List[Dict[str, str]], out_pat
             Each dictionary should contain the 'path' key with the path to the subtitle file and the 'name' key with the name of the subtitle.
         - out_path (str): The path to save the output file.
     """
-    ffmpeg_cmd = [get_ffmpeg_path(), "-i", video_path]
-
-    # Add subtitle input files first
-    for subtitle in subtitles_list:
-        ffmpeg_cmd += ["-i", subtitle['path']]
-
-    # Add maps for video and audio streams
-    ffmpeg_cmd += ["-map", "0:v", "-map", "0:a"]
-
-    # Add subtitle maps and metadata
-    for idx, subtitle in enumerate(subtitles_list):
-        ffmpeg_cmd += ["-map", f"{idx + 1}:s"]
-        ffmpeg_cmd += ["-metadata:s:s:{}".format(idx), "title={}".format(subtitle['language'])]
-
-    # For subtitles, we always use copy for video/audio and configured encoder for subtitles
-    ffmpeg_cmd.extend(['-c:v', 'copy', '-c:a', 'copy'])
+    # For mkv output prefer mkvmerge when installed: remux-only, no codec init
+    if MKVMERGE_BIN and out_path.endswith('.mkv'):
+        mkvmerge_cmd = [MKVMERGE_BIN, '-o', out_path, video_path]
+        for subtitle in subtitles_list:
+            mkvmerge_cmd.extend(['--language', f"0:{subtitle['language']}", subtitle['path']])
+        if DEBUG_MODE:
+            logging.info(f"mkvmerge command: {shlex.join(mkvmerge_cmd)}")
+
+        try:
+            subprocess.run(mkvmerge_cmd, check=True, close_fds=False)
+            return out_path
+
+        except (subprocess.CalledProcessError, OSError) as e:
+            logging.error(f"mkvmerge failed, falling back to ffmpeg: {e}")
+
+    # Build inputs, maps and subtitle metadata in one literal so the list
+    # is sized once; video/audio are always stream-copied here
+    ffmpeg_cmd = [
+        get_ffmpeg_path(), '-i', video_path,
+        *[arg for subtitle in subtitles_list for arg in ('-i', subtitle['path'])],
+        '-map', '0:v', '-map', '0:a',
+        *[arg for idx, subtitle in enumerate(subtitles_list) for arg in
+          ('-map', f'{idx + 1}:s', f'-metadata:s:s:{idx}', f"title={subtitle['language']}")],
+        '-c:v', 'copy', '-c:a', 'copy'
+    ]
     
     # Add subtitle encoding parameters from config
     if PARAM_SUBTITLES:
         ffmpeg_cmd.extend(PARAM_SUBTITLES)
 
+    # Subtitle muxing is always the last pipeline stage
+    if out_path.endswith('.mp4'):
+        ffmpeg_cmd.extend(['-movflags', '+faststart'])
+
     # Overwrite
     ffmpeg_cmd += [out_path, "-y"]
-    logging.info(f"FFmpeg command: {ffmpeg_cmd}")
+
+    # Only stringify the (potentially very long) command when debugging:
+    # shlex.join also yields a shell-pasteable form, unlike the list repr
+    if DEBUG_MODE:
+        logging.info(f"FFmpeg command: {shlex.join(ffmpeg_cmd)}")
 
     # Run join
     if DEBUG_MODE:
-        subprocess.run(ffmpeg_cmd, check=True)
+        # close_fds=False keeps CPython on the posix_spawn fast path, avoiding
+        # a fork-COW of the whole interpreter heap per join
+        subprocess.run(ffmpeg_cmd, check=True, close_fds=False)
     else:
         capture_ffmpeg_real_time(ffmpeg_cmd, "[yellow]FFMPEG [cyan]Join subtitle")
         print()
 
-    return out_path
\ No newline at end of file
+    return out_path
+
+# Join functions addressable by join_videos_batch job type
+_JOIN_FUNCS = {
+    'video': join_video,
+    'audios': join_audios,
+    'subtitle': join_subtitle,
+    'av_and_subs': join_av_and_subs
+}
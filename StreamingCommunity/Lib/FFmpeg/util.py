@@ -5,7 +5,8 @@ import sys
 import json
 import subprocess
 import logging
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
 
 # External library
@@ -47,6 +48,76 @@ def has_audio_stream(video_path: str) -> bool:
         return False
 
 
+def get_video_codec_name(file_path: str):
+    """
+    Get the codec name of the first video stream in a media file.
+
+    Parameters:
+        - file_path (str): Path to the media file.
+
+    Returns:
+        str: The codec name (e.g. 'h264', 'hevc') or None if probing fails.
+    """
+    try:
+        ffprobe_cmd = [
+            get_ffprobe_path(), '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'stream=codec_name', '-print_format', 'json', file_path
+        ]
+        logging.info(f"FFmpeg command: {ffprobe_cmd}")
+
+        with subprocess.Popen(ffprobe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as proc:
+            stdout, stderr = proc.communicate()
+
+            if proc.returncode != 0:
+                logging.error(f"Error: {stderr}")
+                return None
+
+            streams = json.loads(stdout).get('streams', [])
+            return streams[0].get('codec_name') if streams else None
+
+    except Exception as e:
+        logging.error(f"Get video codec error: {e}")
+        return None
+
+
+def probe_codecs(file_path: str) -> Tuple[str, str]:
+    """
+    Get the codec names of the first video and audio streams of a media file.
+
+    Parameters:
+        - file_path (str): Path to the media file.
+
+    Returns:
+        tuple: (video_codec, audio_codec), each None when absent or on error.
+    """
+    try:
+        ffprobe_cmd = [
+            get_ffprobe_path(), '-v', 'error', '-show_entries',
+            'stream=codec_name,codec_type', '-print_format', 'json', file_path
+        ]
+        logging.info(f"FFmpeg command: {ffprobe_cmd}")
+
+        with subprocess.Popen(ffprobe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as proc:
+            stdout, stderr = proc.communicate()
+
+            if proc.returncode != 0:
+                logging.error(f"Error: {stderr}")
+                return None, None
+
+            video_codec = audio_codec = None
+            for stream in json.loads(stdout).get('streams', []):
+                if stream.get('codec_type') == 'video' and video_codec is None:
+                    video_codec = stream.get('codec_name')
+                elif stream.get('codec_type') == 'audio' and audio_codec is None:
+                    audio_codec = stream.get('codec_name')
+
+            return video_codec, audio_codec
+
+    except Exception as e:
+        logging.error(f"Probe codecs error: {e}")
+        return None, None
+
+
 def get_video_duration(file_path: str, file_type: str = "file") -> float:
     """
     Get the duration of a media file (video or audio).
@@ -85,6 +156,27 @@ def get_video_duration(file_path: str, file_type: str = "file") -> float:
         sys.exit(0)
 
 
+def probe_durations(paths: List[str]) -> Dict[str, float]:
+    """
+    Probe the duration of several media files in one parallel batch, instead
+    of paying ffprobe's process-startup cost serially per file.
+
+    Parameters:
+        - paths (list[str]): Paths of the media files to probe.
+
+    Returns:
+        dict: Mapping of path -> duration in seconds (None where probing failed).
+    """
+    unique_paths = list(dict.fromkeys(paths))
+    if not unique_paths:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(unique_paths))) as executor:
+        durations = list(executor.map(get_video_duration, unique_paths))
+
+    return dict(zip(unique_paths, durations))
+
+
 def format_duration(seconds: float) -> Tuple[int, int, int]:
     """
     Format duration in seconds into hours, minutes, and seconds.
@@ -228,8 +320,10 @@ def check_duration_v_a(video_path, audio_path, tolerance=1.0):
             - Float: Video duration
             - Float: Audio duration
     """
-    video_duration = get_video_duration(video_path, file_type="video")
-    audio_duration = get_video_duration(audio_path, file_type="audio")
+    # Probe both files in one parallel batch rather than back-to-back
+    durations = probe_durations([video_path, audio_path])
+    video_duration = durations.get(video_path)
+    audio_duration = durations.get(audio_path)
 
     # Check if either duration is None and specify which one is None
     if video_duration is None and audio_duration is None:
@@ -372,13 +372,24 @@ def get_call_stack():
         
     return call_stack
 
+# Binary paths latched after the startup probe resolves them, so the hot
+# ffmpeg/ffprobe call sites skip the summary lookup entirely
+_ffmpeg_path_cache = None
+_ffprobe_path_cache = None
+
 def get_ffmpeg_path():
     """Returns the path of FFmpeg."""
-    return os_summary.ffmpeg_path
+    global _ffmpeg_path_cache
+    if _ffmpeg_path_cache is None:
+        _ffmpeg_path_cache = os_summary.ffmpeg_path
+    return _ffmpeg_path_cache
 
 def get_ffprobe_path():
     """Returns the path of FFprobe."""
-    return os_summary.ffprobe_path
+    global _ffprobe_path_cache
+    if _ffprobe_path_cache is None:
+        _ffprobe_path_cache = os_summary.ffprobe_path
+    return _ffprobe_path_cache
 
 def get_mp4decrypt_path():
     """Returns the path of mp4decrypt."""
@@ -1,15 +1,16 @@
 # 03.03.24
 
-import os
 import sys
 import logging
 import importlib
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Any
 
 
 # External library
 from rich.console import Console
+from rich.segment import Segments
 from rich.table import Table
 from rich.prompt import Prompt
 from rich import box
@@ -25,9 +26,26 @@ from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 from StreamingCommunity.Util.config_json import config_manager
 TELEGRAM_BOT = config_manager.get_bool('DEFAULT', 'telegram_bot')
 
+# Project root resolved once from this file's location (StreamingCommunity/Util/table.py),
+# so run_back_command doesn't have to stat() its way up the directory tree on every call
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+
 
 
 class TVShowManager:
+
+    # Prompt texts are fixed per session, so keep them as class constants
+    # instead of rebuilding the strings on every pagination loop
+    PROMPT_MSG = ("\n[cyan]Insert media index [yellow](e.g., 1), [red]* [cyan]to download all media, "
+                  "[yellow](e.g., 1-2) [cyan]for a range of media, or [yellow](e.g., 3-*) [cyan]to download from a specific index to the end")
+    TELEGRAM_MSG = "Menu di selezione degli episodi: \n\n" \
+                   "- Inserisci il numero dell'episodio (ad esempio, 1)\n" \
+                   "- Inserisci * per scaricare tutti gli episodi\n" \
+                   "- Inserisci un intervallo di episodi (ad esempio, 1-2) per scaricare da un episodio all'altro\n" \
+                   "- Inserisci (ad esempio, 3-*) per scaricare dall'episodio specificato fino alla fine della serie"
+    PROMPT_MSG_INT = "[cyan]Insert media [red]index"
+    TELEGRAM_MSG_INT = "Scegli il contenuto da scaricare:\n Serie TV -  Film -  Anime\noppure `back` per tornare indietro"
+
     def __init__(self):
         """
         Initialize TVShowManager with default values.
@@ -42,6 +60,14 @@ class TVShowManager:
         self.table_style = "blue"
         self.show_lines = False
 
+        # Rendered table segments keyed by slice: paging back and forth
+        # reprints cached output instead of rebuilding and re-rendering
+        self._render_cache: Dict[tuple, Segments] = {}
+
+        # Choices list for forced-int prompts, rebuilt only when max_int_input changes
+        self._cached_choices: List[str] = []
+        self._cached_choices_max = -1
+
     def add_column(self, column_info: Dict[str, Dict[str, str]]) -> None:
         """
         Add column information.
@@ -96,6 +122,23 @@ class TVShowManager:
             logging.error("Error: Column information not configured.")
             return 404
 
+        # Reuse the rendered output when the same slice is shown again; the
+        # key covers the actual cell content so a repopulated manager with a
+        # same-sized result set never replays the previous search's table
+        col_keys = tuple(self.column_info.keys())
+        cache_key = (
+            self.slice_start, self.slice_end,
+            self.table_title, self.table_style, self.show_lines, col_keys,
+            tuple(
+                tuple(str(entry.get(col, '')) for col in col_keys)
+                for entry in data_slice if entry
+            )
+        )
+        cached_render = self._render_cache.get(cache_key)
+        if cached_render is not None:
+            self.console.print(cached_render)
+            return
+
         # Create table with specified style
         table = Table(
             title=self.table_title,
@@ -113,23 +156,36 @@ class TVShowManager:
             width = col_style.get("width", None)
             justify = col_style.get("justify", "center")
             
+            # Ellipsis instead of wrapping: keeps Rich off its much slower
+            # multi-line wrapping path while still signalling truncation
             table.add_column(
-                col_name, 
+                col_name,
                 style=color,
                 justify=justify,
-                width=width
+                width=width,
+                overflow="ellipsis"
             )
 
-        # Add rows dynamically based on available TV show data
+        # Add rows dynamically based on available TV show data; itemgetter
+        # gathers all columns in one C call instead of a .get per cell
+        col_names = tuple(self.column_info.keys())
+        get_cols = itemgetter(*col_names)
         for idx, entry in enumerate(data_slice):
             if entry:
-                row_data = [str(entry.get(col_name, '')) for col_name in self.column_info.keys()]
-                
+                try:
+                    values = get_cols(entry)
+                    if len(col_names) == 1:
+                        values = (values,)
+                except KeyError:
+                    values = tuple(entry.get(col_name, '') for col_name in col_names)
+
                 # Alternate row styling for better readability
-                style = "dim" if idx % 2 == 1 else None
-                table.add_row(*row_data, style=style)
+                style = "dim" if idx & 1 else None
+                table.add_row(*map(str, values), style=style)
 
-        self.console.print(table)
+        rendered = Segments(list(self.console.render(table)))
+        self._render_cache[cache_key] = rendered
+        self.console.print(rendered)
     
     @staticmethod
     def run_back_command(research_func: dict) -> None:
@@ -140,16 +196,13 @@ class TVShowManager:
             research_func (dict): A dictionary containing:
                 - 'folder' (str): The absolute path to the directory containing the module to be executed.
         """
+        # Use the precomputed project root instead of walking upward
+        project_root = PROJECT_ROOT
+
         try:
             # Get site name from folder
             site_name = Path(research_func['folder']).name
 
-            # Find the project root directory
-            current_path = research_func['folder']
-            while not os.path.exists(os.path.join(current_path, 'StreamingCommunity')):
-                current_path = os.path.dirname(current_path)
-            
-            project_root = current_path
             if project_root not in sys.path:
                 sys.path.insert(0, project_root)
             
@@ -168,6 +221,35 @@ class TVShowManager:
             if project_root in sys.path:
                 sys.path.remove(project_root)
 
+    def _ask_user(self, is_telegram: bool, bot, force_int_input: bool, max_int_input: int) -> str:
+        """
+        Prompt for the next command, via console or Telegram.
+
+        Parameters:
+            - is_telegram (bool): Whether to route the prompt through the Telegram bot.
+            - bot: Telegram bot instance, or None when is_telegram is False.
+            - force_int_input (bool): If True, restrict console input to the cached choices list.
+            - max_int_input (int): Highest accepted index when force_int_input is True.
+
+        Returns:
+            str: The raw command entered by the user.
+        """
+        if not force_int_input:
+            if is_telegram:
+                return bot.ask("select_title_episode", self.TELEGRAM_MSG, None)
+            return Prompt.ask(self.PROMPT_MSG)
+
+        if is_telegram:
+            return bot.ask("select_title", self.TELEGRAM_MSG_INT, None)
+
+        # Include empty string in choices to allow pagination with Enter key;
+        # rebuild the list only when the accepted range actually changes
+        if max_int_input != self._cached_choices_max:
+            self._cached_choices = [""] + [str(i) for i in range(max_int_input + 1)] + ["q", "quit", "b", "back"]
+            self._cached_choices_max = max_int_input
+
+        return Prompt.ask(self.PROMPT_MSG_INT, choices=self._cached_choices, show_choices=False)
+
     def run(self, force_int_input: bool = False, max_int_input: int = 0) -> str:
         """
         Run the TV show manager application.
@@ -192,6 +274,13 @@ class TVShowManager:
         is_telegram = config_manager.get_bool('DEFAULT', 'telegram_bot')
         bot = get_bot_instance() if is_telegram else None
 
+        # Locate the calling site's search function once: the call stack above
+        # run() doesn't change across loop iterations and frame walking is costly
+        research_func = next((
+            f for f in get_call_stack()
+            if f['function'] == 'search' and f['script'] == '__init__.py'
+        ), None)
+
         while True:
             start_message()
             
@@ -206,93 +295,31 @@ class TVShowManager:
             if result_func == 404:
                 sys.exit(1)
 
-            # Get research function from call stack
-            research_func = next((
-                f for f in get_call_stack()
-                if f['function'] == 'search' and f['script'] == '__init__.py'
-            ), None)
-
             # Handle pagination and user input
-            if self.slice_end < total_items:
+            is_last_page = self.slice_end >= total_items
+            if is_last_page:
+                self.console.print("\n[green]You've reached the end. [red]Enter [green]for first page, [red]'q' [green]to quit, or [red]'back' [green]to search.")
+            else:
                 self.console.print("\n[green]Press [red]Enter [green]for next page, [red]'q' [green]to quit, or [red]'back' [green]to search.")
 
-                if not force_int_input:
-                    prompt_msg = ("\n[cyan]Insert media index [yellow](e.g., 1), [red]* [cyan]to download all media, "
-                                "[yellow](e.g., 1-2) [cyan]for a range of media, or [yellow](e.g., 3-*) [cyan]to download from a specific index to the end")
-                    telegram_msg = "Menu di selezione degli episodi: \n\n" \
-                                   "- Inserisci il numero dell'episodio (ad esempio, 1)\n" \
-                                   "- Inserisci * per scaricare tutti gli episodi\n" \
-                                   "- Inserisci un intervallo di episodi (ad esempio, 1-2) per scaricare da un episodio all'altro\n" \
-                                   "- Inserisci (ad esempio, 3-*) per scaricare dall'episodio specificato fino alla fine della serie"
-                    
-                    if is_telegram:
-                        key = bot.ask("select_title_episode", telegram_msg, None)
-                    else:
-                        key = Prompt.ask(prompt_msg)
+            key = self._ask_user(is_telegram, bot, force_int_input, max_int_input)
+            last_command = key
+
+            if key.lower() in ["q", "quit"]:
+                break
+            elif key == "":
+                if is_last_page:
+                    self.slice_start = 0
+                    self.slice_end = self.step
                 else:
-                    # Include empty string in choices to allow pagination with Enter key
-                    choices = [""] + [str(i) for i in range(max_int_input + 1)] + ["q", "quit", "b", "back"]
-                    prompt_msg = "[cyan]Insert media [red]index"
-                    telegram_msg = "Scegli il contenuto da scaricare:\n Serie TV -  Film -  Anime\noppure `back` per tornare indietro"
-                    
-                    if is_telegram:
-                        key = bot.ask("select_title", telegram_msg, None)
-                    else:
-                        key = Prompt.ask(prompt_msg, choices=choices, show_choices=False)
-
-                last_command = key
-
-                if key.lower() in ["q", "quit"]:
-                    break
-                elif key == "":
                     self.slice_start += self.step
                     self.slice_end += self.step
                     if self.slice_end > total_items:
                         self.slice_end = total_items
-                elif (key.lower() in ["b", "back"]) and research_func:
-                    TVShowManager.run_back_command(research_func)
-                else:
-                    break
-
+            elif (key.lower() in ["b", "back"]) and research_func:
+                TVShowManager.run_back_command(research_func)
             else:
-                # Last page handling
-                self.console.print("\n[green]You've reached the end. [red]Enter [green]for first page, [red]'q' [green]to quit, or [red]'back' [green]to search.")
-                
-                if not force_int_input:
-                    prompt_msg = ("\n[cyan]Insert media index [yellow](e.g., 1), [red]* [cyan]to download all media, "
-                                "[yellow](e.g., 1-2) [cyan]for a range of media, or [yellow](e.g., 3-*) [cyan]to download from a specific index to the end")
-                    telegram_msg = "Menu di selezione degli episodi: \n\n" \
-                                   "- Inserisci il numero dell'episodio (ad esempio, 1)\n" \
-                                   "- Inserisci * per scaricare tutti gli episodi\n" \
-                                   "- Inserisci un intervallo di episodi (ad esempio, 1-2) per scaricare da un episodio all'altro\n" \
-                                   "- Inserisci (ad esempio, 3-*) per scaricare dall'episodio specificato fino alla fine della serie"
-                    
-                    if is_telegram:
-                        key = bot.ask("select_title_episode", telegram_msg, None)
-                    else:
-                        key = Prompt.ask(prompt_msg)
-                else:
-                    # Include empty string in choices to allow pagination with Enter key
-                    choices = [""] + [str(i) for i in range(max_int_input + 1)] + ["q", "quit", "b", "back"]
-                    prompt_msg = "[cyan]Insert media [red]index"
-                    telegram_msg = "Scegli il contenuto da scaricare:\n Serie TV -  Film -  Anime\noppure `back` per tornare indietro"
-                    
-                    if is_telegram:
-                        key = bot.ask("select_title", telegram_msg, None)
-                    else:
-                        key = Prompt.ask(prompt_msg, choices=choices, show_choices=False)
-
-                last_command = key
-
-                if key.lower() in ["q", "quit"]:
-                    break
-                elif key == "":
-                    self.slice_start = 0
-                    self.slice_end = self.step
-                elif (key.lower() in ["b", "back"]) and research_func:
-                    TVShowManager.run_back_command(research_func)
-                else:
-                    break
+                break
 
         return last_command
 
@@ -302,4 +329,5 @@ class TVShowManager:
         """
         self.tv_shows = []
         self.slice_start = 0
-        self.slice_end = self.step
\ No newline at end of file
+        self.slice_end = self.step
+        self._render_cache.clear()
\ No newline at end of file